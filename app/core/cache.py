@@ -0,0 +1,234 @@
+# app/core/cache.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+_MISSING = object()
+
+class LRUCache:
+    """
+    Thread-safe LRU cache (in-process)
+    - maxsize: 최대 entry 수
+    - max_bytes: 최대 크기 합계 (sizeof로 계산, None이면 제한 없음)
+    - ttl: entry 유효 시간(초) (None이면 만료 없음)
+    """
+    def __init__(
+            self,
+            name: str,
+            maxsize: int,
+            ttl: float | None = None,
+            max_bytes: int | None = None,
+            sizeof: Callable[[Any], int] = len
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        invalidate/clear 때마다 증가
+        load 전에 읽어 두었다가 set(..., generation=)에 넘기면,
+        load 도중 invalidate 된 경우 오래된 값을 다시 넣지 않는다
+        """
+        return self._generation
+
+    def get(
+            self,
+            key: Hashable,
+            default: Any = None
+    ) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at and expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(
+            self,
+            key: Hashable,
+            default: Any = None
+    ) -> Any:
+        """
+        get과 같지만 hits/misses와 LRU 순서를 바꾸지 않는다 (갱신 전에 현재 값을 읽을 때)
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, expires_at, _ = entry
+            if expires_at and expires_at < time.monotonic():
+                return default
+            return value
+
+    def set(
+            self,
+            key: Hashable,
+            value: Any,
+            generation: int | None = None
+    ) -> None:
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(
+            self,
+            key: Hashable
+    ) -> None:
+        with self._lock:
+            self._generation += 1
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(
+            self,
+            key: Hashable
+    ) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "bytes": self._bytes,
+        }
+
+
+class DiskCache:
+    """
+    Content-addressed bytes cache (on-disk)
+    - key(hex digest)를 file 이름으로 사용
+    - 크기 합계가 max_bytes를 넘으면 가장 오래 사용되지 않은(mtime) file부터 삭제
+    - blocking I/O이므로 async 코드에서는 asyncio.to_thread로 호출할 것
+    """
+    def __init__(
+            self,
+            name: str,
+            directory: str,
+            max_bytes: int
+    ):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._sizes = {
+            entry.name: entry.stat().st_size
+            for entry in os.scandir(directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        }
+        self._bytes = sum(self._sizes.values())
+
+    def get(
+            self,
+            key: str
+    ) -> bytes | None:
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)   # LRU 순서 갱신
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def set(
+            self,
+            key: str,
+            data: bytes
+    ) -> None:
+        if len(data) > self.max_bytes:
+            return
+        path = os.path.join(self.directory, key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for name in self._sizes:
+            try:
+                entries.append((os.stat(os.path.join(self.directory, name)).st_mtime, name))
+            except FileNotFoundError:
+                entries.append((0.0, name))
+        for _, name in sorted(entries):
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            self._bytes -= self._sizes.pop(name)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._sizes),
+            "bytes": self._bytes,
+        }
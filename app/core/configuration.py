@@ -45,6 +45,84 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(default="", env="POSTGRES_DB")
     POSTGRES_HOST: str = Field(default="", env="POSTGRES_HOST")
     POSTGRES_PORT: str = Field(default="", env="POSTGRES_PORT")
+    # 저장소 backend ("sql" | "memory"), memory는 DB 없이 process 내에 저장 (test, benchmark용)
+    REPOSITORY_BACKEND: str = Field(default="sql", env="REPOSITORY_BACKEND")
+    # 설정 시 POSTGRES_* 대신 사용 (예: benchmark용 sqlite+aiosqlite:///bench.db)
+    DATABASE_URL: str | None = Field(default=None, env="DATABASE_URL")
+    DB_ECHO: bool = Field(default=True, env="DB_ECHO")   # SQL logging
+
+    # STT backend ("whisper" | "fake") 및 Whisper 추론 worker pool
+    STT_BACKEND: str = Field(default="whisper", env="STT_BACKEND")
+    STT_MAX_WORKERS: int = Field(default=1, env="STT_MAX_WORKERS")
+    STT_MAX_QUEUE: int = Field(default=8, env="STT_MAX_QUEUE")
+    STT_TIMEOUT_SECONDS: float = Field(default=60.0, env="STT_TIMEOUT_SECONDS")
+    # 설정 시 model을 process마다 load하지 않고 local model server(app.services.stt_server)를 사용
+    STT_SERVER_SOCKET: str | None = Field(default=None, env="STT_SERVER_SOCKET")
+
+    # TTS backend ("gtts" | "fake") 및 worker pool
+    TTS_BACKEND: str = Field(default="gtts", env="TTS_BACKEND")
+    TTS_LANG: str = Field(default="ko", env="TTS_LANG")
+    TTS_TLD: str = Field(default="com", env="TTS_TLD")
+    TTS_MAX_WORKERS: int = Field(default=4, env="TTS_MAX_WORKERS")
+    TTS_MAX_QUEUE: int = Field(default=32, env="TTS_MAX_QUEUE")
+    TTS_TIMEOUT_SECONDS: float = Field(default=30.0, env="TTS_TIMEOUT_SECONDS")
+    TTS_PIPELINE_DEPTH: int = Field(default=3, env="TTS_PIPELINE_DEPTH")   # 동시에 합성하는 문장 수
+    # TTS audio cache (memory LRU + 선택적 disk tier)
+    TTS_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, env="TTS_CACHE_MAX_BYTES")
+    TTS_CACHE_DIR: str | None = Field(default=None, env="TTS_CACHE_DIR")
+    TTS_CACHE_DISK_MAX_BYTES: int = Field(default=1024 * 1024 * 1024, env="TTS_CACHE_DISK_MAX_BYTES")
+
+    # Password hashing (bcrypt) worker pool
+    PASSWORD_HASH_MAX_WORKERS: int = Field(default=2, env="PASSWORD_HASH_MAX_WORKERS")
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=64, env="PASSWORD_HASH_MAX_QUEUE")
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = Field(default=5.0, env="PASSWORD_HASH_TIMEOUT_SECONDS")
+
+    # get_current_user cache
+    USER_CACHE_SIZE: int = Field(default=10_000, env="USER_CACHE_SIZE")
+    USER_CACHE_TTL_SECONDS: float = Field(default=60.0, env="USER_CACHE_TTL_SECONDS")
+
+    # Conversation history cache (app.services.history)
+    HISTORY_CACHE_SIZE: int = Field(default=1_000, env="HISTORY_CACHE_SIZE")   # 대화 수
+    HISTORY_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, env="HISTORY_CACHE_MAX_BYTES")
+
+    # LLM context (app.services.history.build_context)
+    CONTEXT_TOKEN_BUDGET: int = Field(default=3000, env="CONTEXT_TOKEN_BUDGET")   # LLM에 보내는 history의 최대 token 수
+    SUMMARY_MAX_TOKENS: int = Field(default=500, env="SUMMARY_MAX_TOKENS")   # rolling summary의 최대 token 수
+    SUMMARY_REFRESH_MIN_TOKENS: int = Field(default=256, env="SUMMARY_REFRESH_MIN_TOKENS")   # 요약에 새로 반영할 token이 이만큼 쌓이면 갱신
+
+    # LLM 답변 cache (app.services.llm), LLM_CACHE_SIZE=0이면 비활성
+    LLM_CACHE_SIZE: int = Field(default=10_000, env="LLM_CACHE_SIZE")
+    LLM_CACHE_TTL_SECONDS: float = Field(default=3600.0, env="LLM_CACHE_TTL_SECONDS")
+    LLM_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, env="LLM_CACHE_MAX_BYTES")
+    LLM_CACHE_MAX_ENTRY_BYTES: int = Field(default=64 * 1024, env="LLM_CACHE_MAX_ENTRY_BYTES")   # 이보다 긴 답변은 cache하지 않음
+
+    # 요청 제한 (app.core.limiter), "local" | "store"(worker 간 공유)
+    LIMITER_BACKEND: str = Field(default="local", env="LIMITER_BACKEND")
+    RATE_LIMIT_PER_SECOND: float = Field(default=1.0, env="RATE_LIMIT_PER_SECOND")   # user별 chat 요청 token 충전 속도
+    RATE_LIMIT_BURST: int = Field(default=10, env="RATE_LIMIT_BURST")   # 0이면 비활성
+    LLM_MAX_CONCURRENCY: int = Field(default=16, env="LLM_MAX_CONCURRENCY")   # 0이면 비활성
+    LLM_MAX_QUEUE: int = Field(default=64, env="LLM_MAX_QUEUE")
+    LLM_QUEUE_TIMEOUT_SECONDS: float = Field(default=10.0, env="LLM_QUEUE_TIMEOUT_SECONDS")
+
+    # Chat WebSocket (/chat/ws/{conv_id})
+    WS_SEND_QUEUE_SIZE: int = Field(default=64, env="WS_SEND_QUEUE_SIZE")   # 전송 대기 frame 수 (차면 LLM stream이 기다린다)
+    WS_SEND_TIMEOUT_SECONDS: float = Field(default=10.0, env="WS_SEND_TIMEOUT_SECONDS")   # 이 시간 넘게 queue가 차 있으면 연결 종료
+    WS_HEARTBEAT_SECONDS: float = Field(default=20.0, env="WS_HEARTBEAT_SECONDS")
+    WS_IDLE_TIMEOUT_SECONDS: float = Field(default=300.0, env="WS_IDLE_TIMEOUT_SECONDS")
+
+    # 삭제된 Conversation purge (app.services.purger)
+    PURGE_BATCH_SIZE: int = Field(default=500, env="PURGE_BATCH_SIZE")
+    PURGE_INTERVAL_SECONDS: float = Field(default=60.0, env="PURGE_INTERVAL_SECONDS")
+
+    # 요청 profiling (app.core.profiling), 둘 다 설정하지 않으면 비활성
+    PROFILE_TOKEN: str | None = Field(default=None, env="PROFILE_TOKEN")   # X-Profile-Token header 값
+    PROFILE_SAMPLE_RATE: float = Field(default=0.0, env="PROFILE_SAMPLE_RATE")   # 0~1, 무작위로 profiling 할 요청 비율
+    PROFILE_INTERVAL_SECONDS: float = Field(default=0.005, env="PROFILE_INTERVAL_SECONDS")
+    PROFILE_DIR: str | None = Field(default=None, env="PROFILE_DIR")   # folded stack file 저장 위치
+
+    # Model lifecycle (app.services.model_manager)
+    MODEL_WARMUP: bool = Field(default=False, env="MODEL_WARMUP")   # lifespan에서 미리 load
+    MODEL_IDLE_TTL_SECONDS: float = Field(default=0, env="MODEL_IDLE_TTL_SECONDS")   # 0이면 unload 하지 않음
 
 
     class Config:
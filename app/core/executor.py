@@ -0,0 +1,75 @@
+# app/core/executor.py
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException, status
+
+class BoundedExecutor:
+    """
+    Event loop를 막는 blocking 작업(모델 추론 등)을 별도 thread pool에서 실행
+    - max_workers: 동시에 실행되는 작업 수
+    - max_queue: 실행을 기다릴 수 있는 작업 수 (초과 시 503)
+    - timeout: 결과를 기다리는 최대 시간(초) (초과 시 504)
+    """
+    def __init__(
+            self,
+            name: str,
+            max_workers: int,
+            max_queue: int,
+            timeout: float
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """
+        실행 중 + 대기 중인 작업 수
+        """
+        return self._pending
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(
+            self,
+            func: Callable[..., Any],
+            *args: Any
+    ) -> Any:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"{self.name} is busy, try again later",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        # Slot은 timeout이 아니라 worker thread의 작업이 실제로 끝날 때 반환한다
+        try:
+            future = self._pool.submit(func, *args)
+        except RuntimeError:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"{self.name} timed out",
+            )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,320 @@
+# app/core/limiter.py
+
+"""
+요청 제한 (한 user의 과도한 요청이 LLM/STT/TTS를 점유하지 않도록)
+- TokenBucket: user별 요청 속도 제한 (초과 시 429 + Retry-After)
+- ConcurrencyLimiter: LLM 동시 호출 수 제한 + bounded wait queue (queue가 차거나 대기 timeout이면 503 + Retry-After)
+
+LIMITER_BACKEND
+- "local": process 안에서만 상태를 가진다 (worker마다 따로 제한)
+- "store": 상태를 key-value store에 두어 worker 간에 공유한다
+  store는 아래 method만 있으면 되고 (Redis 등으로 교체 가능), 기본은 local fake인 MemoryStore
+    get(key) -> str | None
+    compare_and_set(key, expected, value, ttl) -> bool   (expected=None: key가 없을 때만 set)
+    compare_and_delete(key, expected) -> bool   (값이 expected일 때만 삭제)
+"""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+
+from app.core.cache import LRUCache
+from app.core.configuration import settings
+from app.core.metrics import limiter_rejections
+
+def _retry_after(
+        seconds: float
+) -> dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+def _too_many_requests(
+        name: str,
+        retry_after: float
+) -> HTTPException:
+    limiter_rejections.inc(limiter=name)
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests, try again later",
+        headers=_retry_after(retry_after),
+    )
+
+def _busy(
+        name: str,
+        retry_after: float
+) -> HTTPException:
+    limiter_rejections.inc(limiter=name)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"{name} is busy, try again later",
+        headers=_retry_after(retry_after),
+    )
+
+
+class MemoryStore:
+    """
+    Key-value store의 in-process 구현 (shared-store limiter의 local fake)
+    await 없이 처리하므로 한 event loop 안에서는 각 method가 atomic
+    """
+    def __init__(self):
+        self._data: dict[str, tuple[str, float]] = {}
+
+    def _live(
+            self,
+            key: str
+    ) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(
+            self,
+            key: str
+    ) -> str | None:
+        return self._live(key)
+
+    async def compare_and_set(
+            self,
+            key: str,
+            expected: str | None,
+            value: str,
+            ttl: float
+    ) -> bool:
+        if self._live(key) != expected:
+            return False
+        self._data[key] = (value, time.monotonic() + ttl)
+        return True
+
+    async def compare_and_delete(
+            self,
+            key: str,
+            expected: str
+    ) -> bool:
+        if self._live(key) != expected:
+            return False
+        del self._data[key]
+        return True
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class LocalTokenBucket:
+    """
+    Key(user)별 token bucket (in-process)
+    - rate: 초당 채워지는 token 수, capacity: 최대 token 수 (burst)
+    - 가득 찬 bucket은 저장할 필요가 없으므로 capacity / rate 초 뒤 만료
+    """
+    def __init__(
+            self,
+            name: str,
+            rate: float,
+            capacity: int,
+            maxsize: int = 100_000
+    ):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = LRUCache(name, maxsize=maxsize, ttl=capacity / rate)
+
+    async def acquire(
+            self,
+            key: str
+    ) -> None:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+        if tokens < 1:
+            self._buckets.set(key, (tokens, now))
+            raise _too_many_requests(self.name, (1 - tokens) / self.rate)
+        self._buckets.set(key, (tokens - 1, now))
+
+
+class StoreTokenBucket:
+    """
+    LocalTokenBucket의 shared-store 버전
+    bucket 상태("tokens:updated_at")를 compare-and-set으로 갱신 (worker 간 경쟁 시 재시도)
+    """
+    def __init__(
+            self,
+            name: str,
+            store,
+            rate: float,
+            capacity: int
+    ):
+        self.name = name
+        self.store = store
+        self.rate = rate
+        self.capacity = capacity
+
+    async def acquire(
+            self,
+            key: str
+    ) -> None:
+        key = f"{self.name}:{key}"
+        ttl = self.capacity / self.rate
+        while True:
+            now = time.time()
+            current = await self.store.get(key)
+            if current is None:
+                tokens = float(self.capacity)
+            else:
+                stored_tokens, updated_at = current.split(":")
+                tokens = min(self.capacity, float(stored_tokens) + max(0.0, now - float(updated_at)) * self.rate)
+            allowed = tokens >= 1
+            value = f"{tokens - 1 if allowed else tokens}:{now}"
+            if await self.store.compare_and_set(key, current, value, ttl):
+                break
+        if not allowed:
+            raise _too_many_requests(self.name, (1 - tokens) / self.rate)
+
+
+class LocalConcurrencyLimiter:
+    """
+    동시 실행 수 제한 (in-process, asyncio.Semaphore)
+    - limit: 동시에 실행되는 작업 수
+    - max_queue: slot을 기다릴 수 있는 요청 수 (초과 시 503)
+    - timeout: slot을 기다리는 최대 시간(초) (초과 시 503)
+    """
+    def __init__(
+            self,
+            name: str,
+            limit: int,
+            max_queue: int,
+            timeout: float
+    ):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                raise _busy(self.name, self.timeout)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                raise _busy(self.name, self.timeout)
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class StoreConcurrencyLimiter:
+    """
+    LocalConcurrencyLimiter의 shared-store 버전
+    실행 slot은 limit개의 key("{name}:slot:{i}"), 대기 자리는 max_queue개의 key("{name}:waiting:{i}")이고,
+    비어 있는 key를 compare-and-set으로 차지한다 (값: 요청마다 고유한 holder id)
+    대기 중에는 poll_interval마다 slot을 다시 시도
+    - key마다 ttl이 따로 있으므로 종료된 worker가 반환하지 못한 slot은 lease, 대기 자리는 timeout 뒤에
+      다른 요청의 사용과 관계없이 만료된다
+    - lease: slot을 잡고 있을 수 있는 최대 시간(초), 실행 시간보다 길어야 한다
+    """
+    def __init__(
+            self,
+            name: str,
+            store,
+            limit: int,
+            max_queue: int,
+            timeout: float,
+            poll_interval: float = 0.05,
+            lease: float = 300.0
+    ):
+        self.name = name
+        self.store = store
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._slot_keys = [f"{name}:slot:{i}" for i in range(limit)]
+        self._waiting_keys = [f"{name}:waiting:{i}" for i in range(max_queue)]
+
+    async def _claim(
+            self,
+            keys: list[str],
+            holder: str,
+            ttl: float
+    ) -> str | None:
+        """
+        keys 중 비어 있는(만료된) key 하나를 holder로 차지, 모두 차 있으면 None
+        """
+        for key in keys:
+            if await self.store.compare_and_set(key, None, holder, ttl):
+                return key
+        return None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        holder = str(uuid4())
+        key = await self._claim(self._slot_keys, holder, self.lease)
+        if key is None:
+            waiting_key = await self._claim(self._waiting_keys, holder, self.timeout + self.poll_interval)
+            if waiting_key is None:
+                raise _busy(self.name, self.timeout)
+            try:
+                deadline = time.monotonic() + self.timeout
+                while key is None:
+                    if time.monotonic() >= deadline:
+                        raise _busy(self.name, self.timeout)
+                    await asyncio.sleep(self.poll_interval)
+                    key = await self._claim(self._slot_keys, holder, self.lease)
+            finally:
+                await self.store.compare_and_delete(waiting_key, holder)
+        try:
+            yield
+        finally:
+            await self.store.compare_and_delete(key, holder)
+
+
+def _create_store():
+    return MemoryStore() if settings.LIMITER_BACKEND == "store" else None
+
+store = _create_store()
+
+def _create_user_rate_limit():
+    if settings.RATE_LIMIT_BURST <= 0:
+        return None
+    if store is not None:
+        return StoreTokenBucket("user_rate", store, rate=settings.RATE_LIMIT_PER_SECOND, capacity=settings.RATE_LIMIT_BURST)
+    return LocalTokenBucket("user_rate", rate=settings.RATE_LIMIT_PER_SECOND, capacity=settings.RATE_LIMIT_BURST)
+
+def _create_llm_slots():
+    if settings.LLM_MAX_CONCURRENCY <= 0:
+        return None
+    if store is not None:
+        return StoreConcurrencyLimiter(
+            "llm", store,
+            limit=settings.LLM_MAX_CONCURRENCY,
+            max_queue=settings.LLM_MAX_QUEUE,
+            timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+        )
+    return LocalConcurrencyLimiter(
+        "llm",
+        limit=settings.LLM_MAX_CONCURRENCY,
+        max_queue=settings.LLM_MAX_QUEUE,
+        timeout=settings.LLM_QUEUE_TIMEOUT_SECONDS,
+    )
+
+# None이면 제한 없음 (RATE_LIMIT_BURST=0 / LLM_MAX_CONCURRENCY=0)
+user_rate_limit = _create_user_rate_limit()
+llm_slots = _create_llm_slots()
@@ -0,0 +1,377 @@
+# app/core/metrics.py
+
+"""
+Prometheus text format metrics (in-process, 외부 dependency 없음)
+- Counter / Gauge / Histogram: 기록 시 lock 안에서 덧셈만 한다
+- collector: scrape(/metrics) 시점에만 호출되어 현재 값을 읽는다 (DB pool, cache, worker pool)
+  scrape 하지 않으면 비용이 없다
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# (metric 이름, type, help, [(labels, value), ...])
+Family = tuple[str, str, str, list[tuple[dict, float]]]
+
+def _escape(
+        value: object
+) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(
+        labels: dict
+) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _format_value(
+        value: float
+) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(
+            self,
+            name: str,
+            help: str,
+            labelnames: Iterable[str] = ()
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def _key(
+            self,
+            labels: dict
+    ) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(
+            self,
+            key: tuple
+    ) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def collect(self) -> list[Family]:
+        with self._lock:
+            samples = [(self._labels(key), value) for key, value in self._values.items()]
+        return [(self.name, self.type, self.help, samples)]
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(
+            self,
+            amount: float = 1,
+            **labels
+    ) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(
+            self,
+            amount: float = 1,
+            **labels
+    ) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(
+            self,
+            amount: float = 1,
+            **labels
+    ) -> None:
+        self.inc(-amount, **labels)
+
+    def set(
+            self,
+            value: float,
+            **labels
+    ) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            help: str,
+            labelnames: Iterable[str] = (),
+            buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket별 count..., +Inf count, sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(
+            self,
+            value: float,
+            **labels
+    ) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(
+            self,
+            **labels
+    ):
+        """
+        with 블록 실행 시간(초) 기록 (async 코드에서도 await 포함 wall time)
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> list[Family]:
+        with self._lock:
+            series = [(key, list(values)) for key, values in self._series.items()]
+
+        buckets, sums, counts = [], [], []
+        for key, values in series:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                buckets.append(({**labels, "le": _format_value(bound)}, cumulative))
+            sums.append((labels, values[-1]))
+            counts.append((labels, cumulative))
+        return [
+            (f"{self.name}_bucket", self.type, self.help, buckets),
+            (f"{self.name}_sum", "", "", sums),
+            (f"{self.name}_count", "", "", counts),
+        ]
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+            self,
+            name: str,
+            help: str,
+            labelnames: Iterable[str] = (),
+            buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(
+            self,
+            collector: Callable[[], Iterable[Family]]
+    ) -> None:
+        """
+        scrape 시점에 호출되는 collector 등록
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4)
+        """
+        families: list[Family] = []
+        for metric in self._metrics:
+            families.extend(metric.collect())
+        for collector in self._collectors:
+            families.extend(collector())
+
+        lines = []
+        for name, type, help, samples in families:
+            if type:
+                base = name.removesuffix("_bucket") if type == "histogram" else name
+                lines.append(f"# HELP {base} {help}")
+                lines.append(f"# TYPE {base} {type}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# HTTP
+http_requests = registry.counter(
+    "baekjoon_http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+http_request_seconds = registry.histogram(
+    "baekjoon_http_request_duration_seconds", "HTTP request latency (seconds)", ["method", "route"]
+)
+http_in_flight = registry.gauge("baekjoon_http_requests_in_flight", "HTTP requests being processed")
+ws_connections = registry.gauge("baekjoon_websocket_connections", "Open chat WebSocket connections")
+
+# Limiter(app.core.limiter)가 거절한 요청 수 (429/503)
+limiter_rejections = registry.counter(
+    "baekjoon_limiter_rejections_total", "Requests rejected by a limiter", ["limiter"]
+)
+
+# 처리 단계별 시간 (stt, llm, tts, db, base64)
+stage_seconds = registry.histogram(
+    "baekjoon_stage_duration_seconds", "Time spent per processing stage (seconds)", ["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+class MetricsMiddleware:
+    """
+    Route별 latency / 요청 수 / 처리 중인 요청 수 (pure ASGI middleware)
+    route label은 path template (예: /chat/conversations/{conv_id}) 이므로 cardinality가 고정된다
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            path = _route_template(scope)
+            http_request_seconds.observe(elapsed, method=scope["method"], route=path)
+            http_requests.inc(method=scope["method"], route=path, status=status_code)
+
+def _route_template(
+        scope
+) -> str:
+    """
+    요청이 match 된 route의 path template (include_router prefix 포함)
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # include_router가 route를 복사하지 않고 prefix를 떼어 match하는 경우,
+    # route.path에는 prefix가 없으므로 요청 path에서 route가 match 되는 지점 앞부분을 prefix로 붙인다
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[index:]):
+            return path[:index] + route.path
+    return route.path
+
+def instrument_engine(
+        engine
+) -> None:
+    """
+    DB statement 실행 시간을 stage="db"로 기록
+    시작 시각은 statement의 execution context에 둔다 (실패한 statement는 after 없이 context와 함께 사라짐,
+    pool의 connection에 남지 않는다)
+    """
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            stage_seconds.observe(time.perf_counter() - start, stage="db")
+
+def pool_collector(
+        engine
+) -> Callable[[], list[Family]]:
+    """
+    DB connection pool gauge (scrape 시점에 읽음)
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+
+    def collect() -> list[Family]:
+        families = []
+        for name, attr, help in (
+            ("baekjoon_db_pool_size", "size", "Configured DB pool size"),
+            ("baekjoon_db_pool_checked_out", "checkedout", "DB connections in use"),
+            ("baekjoon_db_pool_overflow", "overflow", "DB overflow connections"),
+        ):
+            if hasattr(pool, attr):
+                families.append((name, "gauge", help, [({}, getattr(pool, attr)())]))
+        return families
+
+    return collect
+
+def cache_collector(
+        caches: Callable[[], dict[str, object]]
+) -> Callable[[], list[Family]]:
+    """
+    Cache hit/miss/eviction counter와 size gauge (LRUCache / DiskCache의 stats())
+    caches: scrape 시점에 {이름: cache}를 반환하는 함수
+    """
+    def collect() -> list[Family]:
+        stats = {name: cache.stats() for name, cache in caches().items() if cache is not None}
+        families = []
+        for key, type, help in (
+            ("hits", "counter", "Cache hits"),
+            ("misses", "counter", "Cache misses"),
+            ("evictions", "counter", "Cache evictions"),
+            ("size", "gauge", "Cache entries"),
+            ("bytes", "gauge", "Cache size (bytes)"),
+        ):
+            suffix = "_total" if type == "counter" else ""
+            samples = [({"cache": name}, stat[key]) for name, stat in stats.items() if key in stat]
+            families.append((f"baekjoon_cache_{key}{suffix}", type, help, samples))
+        return families
+
+    return collect
+
+def executor_collector(
+        executors: dict[str, object]
+) -> Callable[[], list[Family]]:
+    """
+    Worker pool(BoundedExecutor)별 실행 중 + 대기 중인 작업 수
+    """
+    def collect() -> list[Family]:
+        samples = [({"pool": name}, executor.pending) for name, executor in executors.items()]
+        return [("baekjoon_executor_pending", "gauge", "Running + queued jobs per worker pool", samples)]
+
+    return collect
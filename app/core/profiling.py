@@ -0,0 +1,172 @@
+# app/core/profiling.py
+
+"""
+Opt-in 요청 단위 profiling (sampling profiler)
+- X-Profile-Token header가 PROFILE_TOKEN과 같거나, PROFILE_SAMPLE_RATE 확률로 선택된 요청만 profiling
+- 별도 thread가 PROFILE_INTERVAL_SECONDS마다 sys._current_frames()로 모든 thread의 stack을 수집
+  (event loop thread + STT/TTS/password worker thread, idle 상태의 stack은 제외)
+- PROFILE_DIR이 설정되면 응답이 끝날 때까지의 sample을 folded stack 형식으로 저장
+  (flamegraph.pl, speedscope 등에서 바로 열 수 있음)
+- 결과 공개 범위 (함수/file 이름, server 경로가 포함되므로)
+  - token으로 요청한 경우만 응답 header로 반환: X-Profile-Summary (handler가 응답을 시작할 때까지의
+    상위 함수), X-Profile-File (저장 경로)
+  - 무작위 sampling 된 요청은 header 없이 log(summary)와 file로만 남긴다
+- 설정이 없으면 middleware 자체를 등록하지 않으므로 비용이 없다
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.core.configuration import settings
+
+logger = logging.getLogger(__name__)
+
+# 대기 중인 thread의 leaf frame (selector, 빈 worker queue, aiosqlite connection thread)
+_IDLE = {
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+    ("threading.py", "wait"),
+    ("core.py", "_connection_worker_thread"),
+}
+
+class SamplingProfiler:
+    """
+    sys._current_frames() 기반 sampling profiler
+    """
+    def __init__(
+            self,
+            interval: float
+    ):
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                with self._lock:
+                    self.samples[tuple(reversed(stack))] += 1
+
+    def summary(
+            self,
+            top: int = 5
+    ) -> str:
+        """
+        Leaf 함수별 sample 비율 (상위 top개)
+        """
+        with self._lock:
+            samples = dict(self.samples)
+        total = sum(samples.values())
+        if not total:
+            return "samples=0"
+        leaves: Counter[str] = Counter()
+        for stack, count in samples.items():
+            leaves[stack[-1]] += count
+        parts = [f"{name} {count * 100 // total}%" for name, count in leaves.most_common(top)]
+        return f"samples={total}; " + "; ".join(parts)
+
+    def folded(self) -> str:
+        """
+        Folded stack 형식 ("frame;frame;frame count" 한 줄씩)
+        """
+        with self._lock:
+            samples = dict(self.samples)
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in samples.items())
+
+def _write_profile(
+        path: str,
+        folded: str
+) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(folded)
+
+class ProfilingMiddleware:
+    """
+    선택된 요청을 SamplingProfiler로 profiling (pure ASGI middleware)
+    동시에 하나의 요청만 profiling 한다 (sampling은 process 전체의 thread를 대상으로 하므로)
+    """
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+
+    def _authorized(
+            self,
+            scope
+    ) -> bool:
+        """
+        X-Profile-Token header가 PROFILE_TOKEN과 같은 요청 (결과를 응답 header로 받을 수 있음)
+        """
+        if settings.PROFILE_TOKEN:
+            for name, value in scope["headers"]:
+                if name == b"x-profile-token":
+                    return hmac.compare_digest(value, settings.PROFILE_TOKEN.encode())
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        authorized = self._authorized(scope)
+        sampled = settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+        if not (authorized or sampled) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        path = None
+        if settings.PROFILE_DIR:
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}{scope['path'].replace('/', '_')}-{os.getpid()}.folded"
+            path = os.path.join(settings.PROFILE_DIR, name)
+
+        profiler = SamplingProfiler(settings.PROFILE_INTERVAL_SECONDS)
+
+        async def send_with_profile(message):
+            if authorized and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-summary", profiler.summary().encode("latin-1", errors="replace")))
+                if path:
+                    headers.append((b"x-profile-file", path.encode("latin-1", errors="replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            # thread join / file 쓰기는 blocking이므로 event loop 밖에서
+            await asyncio.to_thread(profiler.stop)
+            self._busy.release()
+            if not authorized:
+                logger.info("Profiled %s %s: %s", scope["method"], scope["path"], profiler.summary())
+            if path:
+                await asyncio.to_thread(_write_profile, path, profiler.folded())
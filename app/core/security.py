@@ -8,25 +8,35 @@ import jwt
 from passlib.context import CryptContext
 
 from app.core.configuration import settings
+from app.core.executor import BoundedExecutor
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def verify_password(
+# bcrypt는 요청당 100~300ms CPU를 쓰므로 event loop 밖의 작은 pool에서 실행
+# (login이 몰려도 동시 hashing 수가 제한되어 chat 요청이 밀리지 않는다)
+password_executor = BoundedExecutor(
+    name="password",
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+async def verify_password(
         plain_password: str,
         hashed_password: str
 ) -> bool:
     """
     Password Verification
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await password_executor.run(pwd_context.verify, plain_password, hashed_password)
 
-def get_password_hash(
+async def get_password_hash(
         password: str
 ) -> str:
     """
     Plain Password를 Hashed Password로 변환
     """
-    return pwd_context.hash(password)
+    return await password_executor.run(pwd_context.hash, password)
 
 def create_access_token(
         data: dict,
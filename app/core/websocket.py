@@ -0,0 +1,131 @@
+# app/core/websocket.py
+
+import asyncio
+import json
+import time
+
+from fastapi import WebSocket, status
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.metrics import ws_connections
+
+class SlowConsumer(Exception):
+    """
+    Client가 전송 queue를 send_timeout 넘게 비우지 않음
+    """
+
+
+class WebSocketChannel:
+    """
+    Accept 된 WebSocket의 송수신 관리
+    - 전송은 bounded queue(send_queue_size)를 거쳐 sender task 하나가 순서대로 보낸다
+      queue가 차면 producer(LLM token 등)가 기다리고 (backpressure),
+      send_timeout 넘게 자리가 나지 않으면 SlowConsumer
+    - heartbeat: heartbeat초마다 {"type": "ping"} 전송 (proxy idle close 방지, 끊긴 연결 감지)
+    - receive: idle_timeout 동안 client message가 없으면 None (연결 종료)
+    """
+    def __init__(
+            self,
+            websocket: WebSocket,
+            send_queue_size: int,
+            send_timeout: float,
+            heartbeat: float,
+            idle_timeout: float
+    ):
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self.heartbeat = heartbeat
+        self.idle_timeout = idle_timeout
+        self._queue: asyncio.Queue[tuple[str | bytes, ...]] = asyncio.Queue(maxsize=send_queue_size)
+        self._tasks: list[asyncio.Task] = []
+
+    async def __aenter__(self) -> "WebSocketChannel":
+        ws_connections.inc()
+        self._sender = asyncio.create_task(self._send_loop())
+        self._tasks = [self._sender, asyncio.create_task(self._heartbeat_loop())]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        ws_connections.dec()
+
+    async def _send_loop(self) -> None:
+        while True:
+            frames = await self._queue.get()
+            for frame in frames:
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+            self._queue.task_done()
+
+    async def _heartbeat_loop(self) -> None:
+        ping = json.dumps({"type": "ping"})
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            # queue가 차 있으면 이미 전송 중이므로 생략
+            if not self._queue.full():
+                self._queue.put_nowait((ping,))
+
+    async def send(
+            self,
+            *frames: dict | bytes
+    ) -> None:
+        """
+        Frame들을 연속으로 전송 (dict는 JSON text frame, bytes는 binary frame)
+        한 번에 넘긴 frame 사이에는 다른 message(heartbeat 등)가 끼어들지 않는다
+        """
+        item = tuple(
+            frame if isinstance(frame, bytes) else json.dumps(frame, ensure_ascii=False)
+            for frame in frames
+        )
+        put = asyncio.create_task(self._queue.put(item))
+        done, _ = await asyncio.wait(
+            {put, self._sender}, timeout=self.send_timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if put in done:
+            return
+        put.cancel()
+        if self._sender.done():
+            # sender가 끝났다 = client 연결이 끊겼다
+            raise WebSocketDisconnect()
+        raise SlowConsumer()
+
+    async def receive(
+            self,
+            deadline: float | None = None
+    ) -> dict | None:
+        """
+        다음 client message (websocket.receive 형식)
+        idle_timeout이 지나거나 deadline(time.time())에 도달하거나 연결이 끊기면 None
+        """
+        timeout = self.idle_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+        try:
+            message = await asyncio.wait_for(self.websocket.receive(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+        if message["type"] == "websocket.disconnect":
+            return None
+        return message
+
+    async def close(
+            self,
+            code: int = status.WS_1000_NORMAL_CLOSURE,
+            reason: str | None = None
+    ) -> None:
+        """
+        남은 frame을 보낸 뒤 close (끊긴 연결이면 무시)
+        """
+        if not self._sender.done():
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                pass
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except RuntimeError:
+            pass
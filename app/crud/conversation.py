@@ -1,22 +1,28 @@
 # app/crud/conversation.py
 
-from sqlmodel import select, Session
+from sqlalchemy import tuple_
+from sqlmodel import delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.repository import repository_method
 from app.models.conversation import Conversation
 from typing import Annotated
 from uuid import uuid4
 import datetime as dt
 
-def create_conversation(
-        session: Session,
+@repository_method
+async def create_conversation(
+        session: AsyncSession,
         owner_id: str,
-        title: str
+        title: str,
+        commit: bool = True
 ) -> Conversation:
     """
     Conversation 생성
     - 소유자 (User)
     - Title (대화 제목. 대화의 첫번째 질의로 변경하도록 구현하기)
+    - commit=False: 같은 transaction에서 이어서 Message를 저장할 때 (crud.message.create_messages가 commit)
     """
-    now = dt.datetime.now().isoformat()
+    now = dt.datetime.now(dt.timezone.utc)
     conversation = Conversation(
         id=str(uuid4()),
         owner_id=owner_id,
@@ -24,53 +30,142 @@ def create_conversation(
         last_modified=now,
     )
     session.add(conversation)
-    session.commit()
-    session.refresh(conversation)
+    if commit:
+        await session.commit()
     return conversation
 
-def get_conversation(
-        session: Session,
+@repository_method
+async def get_conversation(
+        session: AsyncSession,
         conversation_id: str
 ) -> Conversation | None:
     """
     Conversation ID로 대화를 찾아 반환하기 (Conversation)
     """
-    statement = select(Conversation).where(Conversation.id == conversation_id)
-    result = session.exec(statement)
+    statement = select(Conversation).where(
+        Conversation.id == conversation_id,
+        Conversation.deleted_at.is_(None)
+    )
+    result = await session.exec(statement)
     return result.first()
 
-def update_last_modified(
-        session: Session,
+@repository_method
+async def update_last_modified(
+        session: AsyncSession,
         conversation_id: str
 ) -> Conversation | None:
     """
     Update Last Modified Date-Time
     대화에 메시지가 추가될 때마다 호출하기
     """
-    conversation = session.get(Conversation, conversation_id)
+    conversation = await session.get(Conversation, conversation_id)
     if conversation:
-        conversation.last_modified = dt.datetime.now().isoformat()
+        conversation.last_modified = dt.datetime.now(dt.timezone.utc)
         session.add(conversation)
-        session.commit()
-        session.refresh(conversation)
+        await session.commit()
+        await session.refresh(conversation)
     return conversation
 
-def list_user_conversation(
-        session:Session,
-        owner_id: str
+@repository_method
+async def update_summary(
+        session: AsyncSession,
+        conv_id: str,
+        summary: str,
+        upto_seq: int
+) -> None:
+    """
+    Rolling summary 갱신 (더 최신 요약이 이미 저장되어 있으면 덮어쓰지 않음)
+    """
+    statement = (
+        update(Conversation)
+        .where(Conversation.id == conv_id, Conversation.summary_upto_seq < upto_seq)
+        .values(summary=summary, summary_upto_seq=upto_seq)
+    )
+    await session.exec(statement)
+    await session.commit()
+
+@repository_method
+async def list_user_conversation(
+        session: AsyncSession,
+        owner_id: str,
+        before: dt.datetime | None = None,
+        after: dt.datetime | None = None,
+        limit: int | None = None,
+        before_id: str | None = None,
+        after_id: str | None = None
 ) -> list[Conversation]:
     """
-    Returns All Conversations (of a user)
+    Returns Conversations (of a user), ordered by (last_modified, id) (최신순)
+    - Keyset pagination: before / after (last_modified 기준 cursor), limit
+    - before_id / after_id: cursor 항목의 id. 같은 last_modified의 대화가 page 경계에서
+      빠지거나 중복되지 않도록 (last_modified, id)로 비교한다 (없으면 last_modified만 비교)
     """
-    statement = select(Conversation).where(Conversation.owner_id == owner_id).order_by(Conversation.last_modified.desc())
-    result = session.exec(statement)
+    statement = select(Conversation).where(
+        Conversation.owner_id == owner_id,
+        Conversation.deleted_at.is_(None)
+    )
+    key = tuple_(Conversation.last_modified, Conversation.id)
+    if before is not None:
+        statement = statement.where(
+            key < tuple_(before, before_id) if before_id is not None else Conversation.last_modified < before
+        )
+    if after is not None:
+        statement = statement.where(
+            key > tuple_(after, after_id) if after_id is not None else Conversation.last_modified > after
+        )
+
+    if after is not None and limit is not None:
+        # after 바로 다음(더 최근) limit개를 가져온 뒤 최신순으로 뒤집기
+        statement = statement.order_by(Conversation.last_modified, Conversation.id).limit(limit)
+        result = await session.exec(statement)
+        return list(reversed(result.all()))
+
+    statement = statement.order_by(Conversation.last_modified.desc(), Conversation.id.desc()).limit(limit)
+    result = await session.exec(statement)
     return result.all()
 
-def delete_conversation(
-        session: Session,
+@repository_method
+async def mark_deleted(
+        session: AsyncSession,
         conv_id: str
 ) -> None:
-    conversation = session.get(Conversation, conv_id)
-    if conversation:
-        session.delete(conversation)
-        session.commit()
\ No newline at end of file
+    """
+    Soft delete: 삭제 시각만 기록 (UPDATE 1회)
+    Message는 purger가 background에서 batch 단위로 삭제한다
+    """
+    statement = (
+        update(Conversation)
+        .where(Conversation.id == conv_id, Conversation.deleted_at.is_(None))
+        .values(deleted_at=dt.datetime.now(dt.timezone.utc))
+    )
+    await session.exec(statement)
+    await session.commit()
+
+@repository_method
+async def list_deleted_conversation_ids(
+        session: AsyncSession,
+        limit: int
+) -> list[str]:
+    """
+    삭제 표시되었지만 아직 purge 되지 않은 Conversation ID (오래된 순)
+    """
+    statement = (
+        select(Conversation.id)
+        .where(Conversation.deleted_at.is_not(None))
+        .order_by(Conversation.deleted_at)
+        .limit(limit)
+    )
+    result = await session.exec(statement)
+    return result.all()
+
+@repository_method
+async def delete_conversation(
+        session: AsyncSession,
+        conv_id: str
+) -> None:
+    """
+    Conversation row 삭제 (purger에서 Message를 모두 지운 뒤 호출)
+    """
+    statement = delete(Conversation).where(Conversation.id == conv_id)
+    await session.exec(statement)
+    await session.commit()
\ No newline at end of file
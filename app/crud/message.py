@@ -1,12 +1,19 @@
 # app/crud/message.py
 
-from sqlmodel import select, Session
-from app.models.message import Message
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlmodel import delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db.repository import repository_method
+from app.models.conversation import PREVIEW_LENGTH, Conversation
+from app.models.message import Message, search_snippet, search_terms
+from app.services.llm import count_tokens
 from typing import Annotated
 from uuid import uuid4
+import datetime as dt
 
-def create_message(
-        session: Session,
+async def create_message(
+        session: AsyncSession,
         conv_id: str,
         sender: str,
         content: str
@@ -17,46 +24,211 @@ def create_message(
     - Sender (User / LLM(bot))
     - Content (메시지 내용)
     """
-    message = Message(
-        id=str(uuid4()),
-        conv_id=conv_id,
-        sender=sender,
-        content=content
-    )
-    session.add(message)
-    session.commit()
-    session.refresh(message)
+    [message] = await create_messages(session, conv_id, [(sender, content)])
     return message
 
-def get_message(
-        session: Session,
+@repository_method
+async def create_messages(
+        session: AsyncSession,
+        conv_id: str,
+        messages: list[tuple[str, str]]
+) -> list[Message]:
+    """
+    Chat turn 단위 저장: (sender, content) 목록을 한 transaction으로 저장
+    - UPDATE conversation 1회: seq 발급(last_seq += n, RETURNING) + last_modified 갱신
+      owner_id도 RETURNING으로 받아 Message에 복사 (검색 index용)
+      (동시 요청에서도 순번이 겹치지 않는다)
+      목록 표시용 message_count / last_message_preview / last_sender도 같이 갱신
+    - INSERT 후 commit 1회. id/seq/created_at은 이미 알고 있으므로 refresh 하지 않는다
+    - 대화가 없거나 삭제 표시되었으면 (turn 도중 삭제 등) 저장하지 않고 404
+    """
+    now = dt.datetime.now(dt.timezone.utc)
+    last_sender, last_content = messages[-1]
+    statement = (
+        update(Conversation)
+        .where(Conversation.id == conv_id, Conversation.deleted_at.is_(None))
+        .values(
+            last_seq=Conversation.last_seq + len(messages),
+            last_modified=now,
+            message_count=Conversation.message_count + len(messages),
+            last_message_preview=last_content[:PREVIEW_LENGTH],
+            last_sender=last_sender,
+        )
+        .returning(Conversation.last_seq, Conversation.owner_id)
+    )
+    result = await session.exec(statement)
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+    last_seq, owner_id = row
+    first_seq = last_seq - len(messages) + 1
+
+    created = [
+        Message(
+            id=str(uuid4()),
+            conv_id=conv_id,
+            owner_id=owner_id,
+            seq=first_seq + i,
+            sender=sender,
+            content=content,
+            token_count=count_tokens(content),
+            created_at=now
+        )
+        for i, (sender, content) in enumerate(messages)
+    ]
+    session.add_all(created)
+    await session.commit()
+    return created
+
+@repository_method
+async def get_message(
+        session: AsyncSession,
         message_id: str
 ) -> Message | None:
     """
     Returns Message by Message ID
     """
     statement = select(Message).where(Message.id == message_id)
-    result = session.exec(statement)
+    result = await session.exec(statement)
     return result.first()
 
-def list_messages_by_conversation(
-        session: Session,
-        conv_id: str
+@repository_method
+async def list_messages_by_conversation(
+        session: AsyncSession,
+        conv_id: str,
+        before: int | None = None,
+        after: int | None = None,
+        limit: int | None = None
 ) -> list[Message]:
     """
-    Returns All messages of Conversation (conv_id)
+    Returns messages of Conversation (conv_id), ordered by seq
+    - Keyset pagination: before / after (seq 기준 cursor), limit
+    - after가 주어지면 after 이후의 가장 오래된 limit개,
+      그렇지 않으면 before 이전(없으면 최신)의 가장 최근 limit개를 반환
     """
     statement = select(Message).where(Message.conv_id == conv_id)
-    result = session.exec(statement)
-    return result.all()
+    if before is not None:
+        statement = statement.where(Message.seq < before)
+    if after is not None:
+        statement = statement.where(Message.seq > after)
 
-def delete_messages_by_conversation(
-        session: Session,
-        conv_id: str
-) -> None:
-    statement = select(Message).where(Message.conv_id == conv_id)
-    messages = session.exec(statement).all()
-    for msg in messages:
-        session.delete(msg)
-    
-    session.commit()
\ No newline at end of file
+    if after is not None or limit is None:
+        statement = statement.order_by(Message.seq).limit(limit)
+        result = await session.exec(statement)
+        return result.all()
+
+    statement = statement.order_by(Message.seq.desc()).limit(limit)
+    result = await session.exec(statement)
+    return list(reversed(result.all()))
+
+@repository_method
+async def delete_messages_by_conversation(
+        session: AsyncSession,
+        conv_id: str,
+        batch_size: int
+) -> int:
+    """
+    Conversation의 Message를 최대 batch_size개 삭제 (DELETE 1회, commit은 호출 측에서)
+    Return: 삭제된 Message 수 (0이면 남은 Message 없음)
+    """
+    batch = select(Message.id).where(Message.conv_id == conv_id).limit(batch_size)
+    statement = delete(Message).where(Message.id.in_(batch))
+    result = await session.exec(statement)
+    return result.rowcount
+
+_SEARCH_SQL = {
+    # (owner_id, search_vector) GIN index로 이 user의 일치 message만 찾는다
+    "postgresql": """
+        SELECT m.id AS message_id, m.conv_id, m.seq, m.sender, c.title AS conversation_title,
+               m.content, ts_rank(m.search_vector, to_tsquery('simple', :query)) AS score
+        FROM message AS m
+        JOIN conversation AS c ON c.id = m.conv_id
+        WHERE m.owner_id = :owner_id AND m.search_vector @@ to_tsquery('simple', :query)
+          AND c.deleted_at IS NULL
+        ORDER BY score DESC, m.created_at DESC
+        LIMIT :limit OFFSET :offset
+    """,
+    # query에 owner_id column 조건이 들어 있다 (FTS index 안에서 owner로 좁힘)
+    # bm25는 작을수록 관련도가 높으므로 부호를 바꿔 score로 사용 (owner_id column은 가중치 0)
+    "sqlite": """
+        SELECT m.id AS message_id, m.conv_id, m.seq, m.sender, c.title AS conversation_title,
+               m.content, -bm25(message_fts, 1.0, 0.0) AS score
+        FROM message_fts
+        JOIN message AS m ON m.rowid = message_fts.rowid
+        JOIN conversation AS c ON c.id = m.conv_id
+        WHERE message_fts MATCH :query
+          AND c.deleted_at IS NULL
+        ORDER BY bm25(message_fts, 1.0, 0.0), m.created_at DESC
+        LIMIT :limit OFFSET :offset
+    """,
+}
+
+@repository_method
+async def search_messages(
+        session: AsyncSession,
+        owner_id: str,
+        query: str,
+        limit: int,
+        offset: int = 0
+) -> list[dict]:
+    """
+    User(owner_id)의 대화에서 query의 모든 단어(prefix)를 포함하는 Message 검색 (관련도 순)
+    Return: message_id, conv_id, seq, sender, conversation_title, snippet(HTML escape + <b>일치</b>), score
+    - full-text index가 없는 dialect는 LIKE scan으로 대신한다 (부분 문자열 일치, 최신 순, score 0)
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        query = " & ".join(f"'{term}':*" for term in terms)
+    elif dialect == "sqlite":
+        owner = owner_id.replace('"', '""')
+        query = f'owner_id : "{owner}" AND ' + " AND ".join(f'content : "{term}"*' for term in terms)
+    else:
+        return await _search_messages_like(session, owner_id, terms, limit, offset)
+
+    result = await session.execute(
+        text(_SEARCH_SQL[dialect]),
+        {"query": query, "owner_id": owner_id, "limit": limit, "offset": offset},
+    )
+    rows = []
+    for row in result.mappings().all():
+        row = dict(row)
+        row["snippet"] = search_snippet(row.pop("content"), terms)
+        rows.append(row)
+    return rows
+
+async def _search_messages_like(
+        session: AsyncSession,
+        owner_id: str,
+        terms: list[str],
+        limit: int,
+        offset: int
+) -> list[dict]:
+    statement = (
+        select(Message, Conversation.title)
+        .join(Conversation, Conversation.id == Message.conv_id)
+        .where(Message.owner_id == owner_id, Conversation.deleted_at.is_(None))
+        .where(*(
+            func.lower(Message.content).like(f"%{term.replace('_', '/_')}%", escape="/")
+            for term in terms
+        ))
+        .order_by(Message.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await session.exec(statement)
+    return [
+        {
+            "message_id": message.id,
+            "conv_id": message.conv_id,
+            "seq": message.seq,
+            "sender": message.sender,
+            "conversation_title": title,
+            "snippet": search_snippet(message.content, terms),
+            "score": 0.0,
+        }
+        for message, title in result.all()
+    ]
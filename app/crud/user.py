@@ -1,12 +1,21 @@
 # app/crud/user.py
 
-from sqlmodel import select, Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import LRUCache
+from app.core.configuration import settings
+from app.db.repository import repository_method
 from app.models.user import User
 from typing import Annotated
 from uuid import uuid4
 
-def create_user(
-        session: Session,
+# 인증된 사용자 cache (key: token subject = email, value: UserOut)
+# get_current_user에서 채우고, profile이 바뀌는 write에서 invalidate 한다
+user_cache = LRUCache("user", maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+@repository_method
+async def create_user(
+        session: AsyncSession,
         username: str,
         email: str,
         hashed_password: str,
@@ -27,44 +36,60 @@ def create_user(
         photo_url=photo_url,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
-def get_user_by_email(
-        session: Session,
+@repository_method
+async def get_user_by_email(
+        session: AsyncSession,
         email:str
 ) -> User | None:
     """
     Returns User by E-mail
     """
     statement = select(User).where(User.email == email)
-    result = session.exec(statement)
+    result = await session.exec(statement)
     return result.first()
 
-def get_user_by_username(
-        session: Session,
+@repository_method
+async def get_user_by_username(
+        session: AsyncSession,
         username: str
 ) -> User | None:
     """
     Returns User by User Name
     """
     statement = select(User).where(User.username == username)
-    result = session.exec(statement)
+    result = await session.exec(statement)
     return result.first()
 
-def update_user_photo(
-        session: Session,
+async def update_user_photo(
+        session: AsyncSession,
+        user_id: str,
+        photo_url: str
+) -> User | None:
+    """
+    Updates User Photo (+ user cache invalidate)
+    """
+    user = await save_user_photo(session, user_id, photo_url)
+    if user:
+        user_cache.invalidate(user.email)
+    return user
+
+@repository_method
+async def save_user_photo(
+        session: AsyncSession,
         user_id: str,
         photo_url: str
 ) -> User | None:
     """
-    Updates User Photo
+    User Photo 저장
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if user:
         user.photo_url = photo_url
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
     return user
\ No newline at end of file
@@ -1,22 +1,36 @@
 # app/db/database.py
 
-from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core import metrics
 from app.core.configuration import settings
+from app.db import memory
 
-DATABASE_URL = (
-    f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+DATABASE_URL = settings.DATABASE_URL or (
+    f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
     f"@{settings.POSTGRES_HOST}/{settings.POSTGRES_DB}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
+if settings.REPOSITORY_BACKEND == "memory":
+    # DB 없이 app.db.memory에 저장 (session 자리에 MemoryRepository가 들어간다)
+    engine = None
+    async_session = memory.open_session
+else:
+    engine = create_async_engine(DATABASE_URL, echo=settings.DB_ECHO)
+    metrics.instrument_engine(engine)
 
-def get_session():
-    with Session(engine) as session:
+    # commit 이후에도 객체 속성을 그대로 읽을 수 있도록 expire_on_commit=False
+    # (async session에서는 expired 속성의 lazy load가 불가능하다)
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+async def get_session():
+    async with async_session() as session:
         yield session
 
 
-# def init_db():
-#     with engine.begin() as connect:
-#         await connect.run_sync(SQLModel.metadata.create_all)
-def init_db():
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+async def init_db():
+    if engine is None:
+        return
+    async with engine.begin() as connect:
+        await connect.run_sync(SQLModel.metadata.create_all)
@@ -0,0 +1,424 @@
+# app/db/memory.py
+
+"""
+In-memory repository (REPOSITORY_BACKEND=memory)
+app/crud/*의 @repository_method 함수와 같은 이름/인자의 method를 제공한다.
+
+- 저장: id -> model 객체 (User, Conversation, Message)
+- Secondary index
+  - email -> user id, username -> user ids
+  - owner -> 정렬된 (last_modified, conversation id) 목록 (keyset pagination을 bisect로)
+  - conversation -> seq 순서의 Message 목록 (seq 기준 cursor를 bisect로)
+  - 삭제 표시된 conversation -> deleted_at
+  - 검색: owner별 term -> {message id: 출현 횟수} (inverted index) + 정렬된 term 목록 (prefix 검색을 bisect로)
+    (다른 user의 message는 검색 대상에 들어오지 않는다)
+- 모든 method는 await 없이 끝나므로 event loop 안에서 원자적으로 실행된다 (process 하나 기준)
+"""
+
+import bisect
+import datetime as dt
+import math
+from collections import Counter
+from uuid import uuid4
+
+from fastapi import HTTPException, status
+
+from app.models.conversation import PREVIEW_LENGTH, Conversation
+from app.models.message import Message, search_snippet, search_terms
+from app.models.user import User
+from app.services.llm import count_tokens
+
+_MAX_ID = "\U0010ffff"
+
+def _utc(
+        value: dt.datetime
+) -> dt.datetime:
+    return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+
+class MemoryRepository:
+    def __init__(self):
+        self.users: dict[str, User] = {}
+        self.user_id_by_email: dict[str, str] = {}
+        self.user_ids_by_username: dict[str, list[str]] = {}
+
+        self.conversations: dict[str, Conversation] = {}
+        self.conversations_by_owner: dict[str, list[tuple[dt.datetime, str]]] = {}
+        self.deleted_conversations: dict[str, dt.datetime] = {}
+
+        self.messages: dict[str, Message] = {}
+        self.messages_by_conversation: dict[str, list[Message]] = {}
+        self.seqs_by_conversation: dict[str, list[int]] = {}
+
+        # owner id -> term -> {message id: 출현 횟수} / 정렬된 term 목록 / 색인된 message 수
+        self.postings: dict[str, dict[str, dict[str, int]]] = {}
+        self.terms: dict[str, list[str]] = {}
+        self.indexed_counts: dict[str, int] = {}
+
+    # async_session()과 같은 방식으로 사용 (async with async_session() as session)
+    async def __aenter__(self) -> "MemoryRepository":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # User
+    async def create_user(
+            self,
+            username: str,
+            email: str,
+            hashed_password: str,
+            photo_url: str | None = None
+    ) -> User:
+        if email in self.user_id_by_email:
+            raise ValueError("User (email) already exists")
+        user = User(
+            id=str(uuid4()),
+            email=email,
+            username=username,
+            hashed_password=hashed_password,
+            photo_url=photo_url,
+        )
+        self.users[user.id] = user
+        self.user_id_by_email[email] = user.id
+        self.user_ids_by_username.setdefault(username, []).append(user.id)
+        return user
+
+    async def get_user_by_email(
+            self,
+            email: str
+    ) -> User | None:
+        user_id = self.user_id_by_email.get(email)
+        return self.users[user_id] if user_id else None
+
+    async def get_user_by_username(
+            self,
+            username: str
+    ) -> User | None:
+        user_ids = self.user_ids_by_username.get(username)
+        return self.users[user_ids[0]] if user_ids else None
+
+    async def save_user_photo(
+            self,
+            user_id: str,
+            photo_url: str
+    ) -> User | None:
+        user = self.users.get(user_id)
+        if user:
+            user.photo_url = photo_url
+        return user
+
+    # Conversation
+    def _index_conversation(
+            self,
+            conversation: Conversation
+    ) -> None:
+        key = (_utc(conversation.last_modified), conversation.id)
+        bisect.insort(self.conversations_by_owner.setdefault(conversation.owner_id, []), key)
+
+    def _unindex_conversation(
+            self,
+            conversation: Conversation
+    ) -> None:
+        keys = self.conversations_by_owner.get(conversation.owner_id, [])
+        key = (_utc(conversation.last_modified), conversation.id)
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def _touch(
+            self,
+            conversation: Conversation,
+            now: dt.datetime
+    ) -> None:
+        if conversation.deleted_at is None:
+            self._unindex_conversation(conversation)
+        conversation.last_modified = now
+        if conversation.deleted_at is None:
+            self._index_conversation(conversation)
+
+    async def create_conversation(
+            self,
+            owner_id: str,
+            title: str,
+            commit: bool = True
+    ) -> Conversation:
+        conversation = Conversation(
+            id=str(uuid4()),
+            owner_id=owner_id,
+            title=title,
+            last_modified=dt.datetime.now(dt.timezone.utc),
+        )
+        self.conversations[conversation.id] = conversation
+        self.messages_by_conversation[conversation.id] = []
+        self.seqs_by_conversation[conversation.id] = []
+        self._index_conversation(conversation)
+        return conversation
+
+    async def get_conversation(
+            self,
+            conversation_id: str
+    ) -> Conversation | None:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None or conversation.deleted_at is not None:
+            return None
+        return conversation
+
+    async def update_last_modified(
+            self,
+            conversation_id: str
+    ) -> Conversation | None:
+        conversation = self.conversations.get(conversation_id)
+        if conversation:
+            self._touch(conversation, dt.datetime.now(dt.timezone.utc))
+        return conversation
+
+    async def update_summary(
+            self,
+            conv_id: str,
+            summary: str,
+            upto_seq: int
+    ) -> None:
+        conversation = self.conversations.get(conv_id)
+        if conversation and conversation.summary_upto_seq < upto_seq:
+            conversation.summary = summary
+            conversation.summary_upto_seq = upto_seq
+
+    async def list_user_conversation(
+            self,
+            owner_id: str,
+            before: dt.datetime | None = None,
+            after: dt.datetime | None = None,
+            limit: int | None = None,
+            before_id: str | None = None,
+            after_id: str | None = None
+    ) -> list[Conversation]:
+        keys = self.conversations_by_owner.get(owner_id, [])
+        lo = bisect.bisect_right(keys, (_utc(after), after_id or _MAX_ID)) if after is not None else 0
+        hi = bisect.bisect_left(keys, (_utc(before), before_id or "")) if before is not None else len(keys)
+        if after is not None and limit is not None:
+            window = keys[lo:min(hi, lo + limit)]
+        else:
+            window = keys[max(lo, hi - limit):hi] if limit is not None else keys[lo:hi]
+        return [self.conversations[conv_id] for _, conv_id in reversed(window)]
+
+    async def mark_deleted(
+            self,
+            conv_id: str
+    ) -> None:
+        conversation = self.conversations.get(conv_id)
+        if conversation and conversation.deleted_at is None:
+            self._unindex_conversation(conversation)
+            conversation.deleted_at = dt.datetime.now(dt.timezone.utc)
+            self.deleted_conversations[conv_id] = conversation.deleted_at
+
+    async def list_deleted_conversation_ids(
+            self,
+            limit: int
+    ) -> list[str]:
+        return sorted(self.deleted_conversations, key=self.deleted_conversations.get)[:limit]
+
+    async def delete_conversation(
+            self,
+            conv_id: str
+    ) -> None:
+        conversation = self.conversations.pop(conv_id, None)
+        if conversation and conversation.deleted_at is None:
+            self._unindex_conversation(conversation)
+        self.deleted_conversations.pop(conv_id, None)
+        for message in self.messages_by_conversation.pop(conv_id, []):
+            self.messages.pop(message.id, None)
+            if conversation:
+                self._unindex_message(conversation.owner_id, message)
+        self.seqs_by_conversation.pop(conv_id, None)
+
+    # Message
+    async def create_messages(
+            self,
+            conv_id: str,
+            messages: list[tuple[str, str]]
+    ) -> list[Message]:
+        conversation = self.conversations.get(conv_id)
+        if conversation is None or conversation.deleted_at is not None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+
+        now = dt.datetime.now(dt.timezone.utc)
+        first_seq = conversation.last_seq + 1
+        created = [
+            Message(
+                id=str(uuid4()),
+                conv_id=conv_id,
+                owner_id=conversation.owner_id,
+                seq=first_seq + i,
+                sender=sender,
+                content=content,
+                token_count=count_tokens(content),
+                created_at=now
+            )
+            for i, (sender, content) in enumerate(messages)
+        ]
+        for message in created:
+            self.messages[message.id] = message
+            self.messages_by_conversation[conv_id].append(message)
+            self.seqs_by_conversation[conv_id].append(message.seq)
+            self._index_message(conversation.owner_id, message)
+
+        last_sender, last_content = messages[-1]
+        conversation.last_seq += len(messages)
+        conversation.message_count += len(messages)
+        conversation.last_message_preview = last_content[:PREVIEW_LENGTH]
+        conversation.last_sender = last_sender
+        self._touch(conversation, now)
+        return created
+
+    async def get_message(
+            self,
+            message_id: str
+    ) -> Message | None:
+        return self.messages.get(message_id)
+
+    async def list_messages_by_conversation(
+            self,
+            conv_id: str,
+            before: int | None = None,
+            after: int | None = None,
+            limit: int | None = None
+    ) -> list[Message]:
+        messages = self.messages_by_conversation.get(conv_id, [])
+        seqs = self.seqs_by_conversation.get(conv_id, [])
+        lo = bisect.bisect_right(seqs, after) if after is not None else 0
+        hi = bisect.bisect_left(seqs, before) if before is not None else len(seqs)
+        if limit is None:
+            return messages[lo:hi]
+        if after is not None:
+            return messages[lo:min(hi, lo + limit)]
+        return messages[max(lo, hi - limit):hi]
+
+    async def delete_messages_by_conversation(
+            self,
+            conv_id: str,
+            batch_size: int
+    ) -> int:
+        messages = self.messages_by_conversation.get(conv_id, [])
+        conversation = self.conversations.get(conv_id)
+        batch = messages[:batch_size]
+        for message in batch:
+            self.messages.pop(message.id, None)
+            if conversation:
+                self._unindex_message(conversation.owner_id, message)
+        del messages[:batch_size]
+        del self.seqs_by_conversation.get(conv_id, [])[:batch_size]
+        return len(batch)
+
+    # Search
+    def _index_message(
+            self,
+            owner_id: str,
+            message: Message
+    ) -> None:
+        owner_postings = self.postings.setdefault(owner_id, {})
+        owner_terms = self.terms.setdefault(owner_id, [])
+        for term, count in Counter(search_terms(message.content)).items():
+            postings = owner_postings.get(term)
+            if postings is None:
+                postings = owner_postings[term] = {}
+                bisect.insort(owner_terms, term)
+            postings[message.id] = count
+        self.indexed_counts[owner_id] = self.indexed_counts.get(owner_id, 0) + 1
+
+    def _unindex_message(
+            self,
+            owner_id: str,
+            message: Message
+    ) -> None:
+        owner_postings = self.postings.get(owner_id, {})
+        owner_terms = self.terms.get(owner_id, [])
+        for term in set(search_terms(message.content)):
+            postings = owner_postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(message.id, None)
+            if not postings:
+                del owner_postings[term]
+                del owner_terms[bisect.bisect_left(owner_terms, term)]
+        self.indexed_counts[owner_id] = self.indexed_counts.get(owner_id, 1) - 1
+
+    def _prefix_terms(
+            self,
+            owner_id: str,
+            prefix: str
+    ) -> list[str]:
+        owner_terms = self.terms.get(owner_id, [])
+        start = bisect.bisect_left(owner_terms, prefix)
+        end = bisect.bisect_left(owner_terms, prefix + _MAX_ID)
+        return owner_terms[start:end]
+
+    async def search_messages(
+            self,
+            owner_id: str,
+            query: str,
+            limit: int,
+            offset: int = 0
+    ) -> list[dict]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        # owner의 index에서만: query 단어마다 prefix가 일치하는 term의 postings를 모으고,
+        # 모든 단어를 포함하는 message만 남긴다 (AND)
+        owner_postings = self.postings.get(owner_id, {})
+        total = self.indexed_counts.get(owner_id) or 1
+        scores: dict[str, float] | None = None
+        for term in terms:
+            term_scores: dict[str, float] = {}
+            for indexed in self._prefix_terms(owner_id, term):
+                postings = owner_postings[indexed]
+                idf = math.log(1 + total / len(postings))
+                for message_id, count in postings.items():
+                    term_scores[message_id] = term_scores.get(message_id, 0.0) + count * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    message_id: score + term_scores[message_id]
+                    for message_id, score in scores.items()
+                    if message_id in term_scores
+                }
+            if not scores:
+                return []
+
+        hits = []
+        for message_id, score in scores.items():
+            message = self.messages[message_id]
+            conversation = self.conversations.get(message.conv_id)
+            if conversation is None or conversation.deleted_at is not None:
+                continue
+            hits.append((score, message, conversation))
+        hits.sort(key=lambda hit: (-hit[0], -hit[1].created_at.timestamp()))
+
+        return [
+            {
+                "message_id": message.id,
+                "conv_id": message.conv_id,
+                "seq": message.seq,
+                "sender": message.sender,
+                "conversation_title": conversation.title,
+                "snippet": search_snippet(message.content, terms),
+                "score": score,
+            }
+            for score, message, conversation in hits[offset:offset + limit]
+        ]
+
+# REPOSITORY_BACKEND=memory일 때 process 전체가 공유하는 저장소
+repository = MemoryRepository()
+
+def open_session() -> MemoryRepository:
+    """
+    async_session()과 같은 사용법: async with open_session() as session
+    """
+    return repository
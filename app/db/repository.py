@@ -0,0 +1,28 @@
+# app/db/repository.py
+
+"""
+Repository backend 선택 (Settings.REPOSITORY_BACKEND)
+- "sql": app/crud/*의 SQLModel 구현 (PostgreSQL, 또는 DATABASE_URL의 SQLite)
+- "memory": app.db.memory.MemoryRepository (process 내 dict + secondary index, DB 없음, test/benchmark용)
+
+Router와 service는 backend와 상관없이 app/crud/*의 함수를 session
+(get_session / async_session()이 주는 객체)과 함께 호출한다.
+저장소를 다루는 crud 함수는 @repository_method로 감싸져 있어서,
+session이 MemoryRepository이면 같은 이름의 method로 보내고 아니면 SQL 구현을 실행한다.
+"""
+
+import functools
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.db.memory import MemoryRepository
+
+def repository_method(
+        func: Callable[..., Awaitable[Any]]
+) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(func)
+    async def wrapper(session, *args, **kwargs):
+        if isinstance(session, MemoryRepository):
+            return await getattr(session, func.__name__)(*args, **kwargs)
+        return await func(session, *args, **kwargs)
+    return wrapper
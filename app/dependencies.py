@@ -1,26 +1,27 @@
 # app/dependencies.py
 
 from typing import Annotated
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core import limiter
 from app.core.security import decode_access_token
-from app.db.database import engine
+from app.db.database import async_session
 from app.schemas.user import UserOut
 from app.crud import user as crud_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session() as session:
         yield session
 
 async def get_current_user(
         token: Annotated[str, Depends(oauth2_scheme)],
-        session: Annotated[Session, Depends(get_session)]
+        session: Annotated[AsyncSession, Depends(get_session)]
 ) -> UserOut:
     payload = decode_access_token(token)
     if payload is None:
@@ -29,12 +30,30 @@ async def get_current_user(
             detail="Invalid Token"
         )
     email: str = payload.get("sub")
-    db_user = crud_user.get_user_by_email(session, email)
+
+    # Cache hit이면 DB 조회 없이 반환
+    user = crud_user.user_cache.get(email)
+    if user is not None:
+        return user
+
+    generation = crud_user.user_cache.generation
+    db_user = await crud_user.get_user_by_email(session, email)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserOut(
+    user = UserOut(
         id=db_user.id,
         username=db_user.username,
         email=db_user.email,
         photo_url=db_user.photo_url
-    )
\ No newline at end of file
+    )
+    crud_user.user_cache.set(email, user, generation=generation)
+    return user
+
+async def rate_limit_user(
+        user: Annotated[UserOut, Depends(get_current_user)]
+) -> None:
+    """
+    User별 token bucket (LLM을 호출하는 chat endpoint에 사용, 초과 시 429)
+    """
+    if limiter.user_rate_limit is not None:
+        await limiter.user_rate_limit.acquire(user.id)
@@ -1,17 +1,44 @@
 # app/main.py
 
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
+from app.core import metrics
+from app.core.profiling import ProfilingMiddleware
 from app.core.configuration import settings
 from app.routers import auth, chat, google_auth
-from app.db.database import init_db
+from app.core.security import password_executor
+from app.crud import user as crud_user
+from app.db.database import engine, init_db
+from app.services import history, llm, model_manager, purger, stt, tts
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    await init_db()
+
+    tasks = [asyncio.create_task(purger.run(settings.PURGE_INTERVAL_SECONDS))]
+    # Model은 기본적으로 첫 사용 시 load, MODEL_WARMUP이면 시작 직후 background에서 load
+    if settings.MODEL_WARMUP and not settings.STT_SERVER_SOCKET:
+        tasks.append(asyncio.create_task(model_manager.warm_up()))
+    if settings.MODEL_IDLE_TTL_SECONDS > 0:
+        tasks.append(asyncio.create_task(model_manager.reap_idle(settings.MODEL_IDLE_TTL_SECONDS / 2)))
+
     yield
 
+    # purger는 현재 batch를 commit 한 뒤 멈추고, 나머지 task는 취소. 모두 끝날 때까지 기다린다
+    # (기다리지 않으면 DB transaction 도중에 취소된 task 때문에 종료가 멈출 수 있음)
+    purger.stop()
+    for task in tasks[1:]:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await history.drain()
+    stt.executor.shutdown()
+    tts.executor.shutdown()
+    password_executor.shutdown()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
@@ -32,6 +59,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
+# 요청 profiling: 설정된 경우에만 등록 (그 외 요청 경로에 비용 없음)
+if settings.PROFILE_TOKEN or settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
+
+# Scrape 시점에만 읽는 값들 (요청 처리 경로에는 비용 없음)
+if engine is not None:
+    metrics.registry.register_collector(metrics.pool_collector(engine))
+metrics.registry.register_collector(metrics.cache_collector(lambda: {
+    "user": crud_user.user_cache,
+    "history": history.history_cache,
+    "llm": llm.response_cache,
+    "tts": tts.memory_cache,
+    "tts_disk": tts.disk_cache,
+}))
+metrics.registry.register_collector(metrics.executor_collector({
+    "stt": stt.executor,
+    "tts": tts.executor,
+    "password": password_executor,
+}))
 
 # Router 등록하기
 app.include_router(auth.router, prefix="/auth", tags=["Auth"])
@@ -41,3 +88,29 @@ app.include_router(google_auth.router, prefix="/oauth", tags=["Oauth"])
 @app.get("/")
 def root():
     return {"message": "Baekjoon Talk - 0.0.1"}
+
+@app.get("/health/live")
+def liveness():
+    """
+    Process가 요청을 처리할 수 있는지 (model load 여부와 무관)
+    """
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+def readiness():
+    """
+    Traffic을 받을 준비가 되었는지
+    MODEL_WARMUP이 켜져 있으면 warm-up이 끝난 뒤부터 ready
+    """
+    ready = not settings.MODEL_WARMUP or bool(settings.STT_SERVER_SOCKET) or model_manager.is_warmed_up()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "warming_up", "models": model_manager.status()},
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus text format
+    """
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,13 +1,42 @@
 # app/models/conversation.py
 
-from sqlmodel import SQLModel, Field
+from sqlalchemy import DateTime, desc, text
+from sqlmodel import SQLModel, Field, Index
 from typing import Annotated
 from uuid import uuid4
+import datetime as dt
+
+PREVIEW_LENGTH = 100   # last_message_preview 최대 길이
 
 class Conversation(SQLModel, table=True):
     __tablename__ = "conversation"
+    __table_args__ = (
+        # list_user_conversation: WHERE owner_id = ? AND deleted_at IS NULL ORDER BY last_modified DESC, id DESC
+        # (id는 같은 last_modified 사이의 keyset cursor tiebreaker)
+        Index(
+            "ix_conversation_owner_id_last_modified_id", "owner_id", desc("last_modified"), desc("id"),
+            postgresql_where=text("deleted_at IS NULL"),
+            sqlite_where=text("deleted_at IS NULL"),
+        ),
+        # purger: 삭제 표시된 대화만 (partial index)
+        Index(
+            "ix_conversation_deleted_at", "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
     id: Annotated[str, Field(default_factory=lambda: str(uuid4()), primary_key=True)]
     owner_id: str   # User ID
     title: str      # Conversation Title
-    last_modified: str
\ No newline at end of file
+    last_modified: Annotated[dt.datetime, Field(sa_type=DateTime(timezone=True))]
+    last_seq: int = 0   # 마지막으로 발급된 Message 순번
+    # 대화 목록 표시용 (Message 저장 시 같은 UPDATE에서 갱신, 목록 조회 시 Message를 읽지 않음)
+    message_count: int = 0
+    last_message_preview: str | None = None
+    last_sender: str | None = None
+    # LLM context에서 빠진 오래된 turn의 rolling summary (seq <= summary_upto_seq 까지 반영)
+    summary: str | None = None
+    summary_upto_seq: int = 0
+    # 삭제 표시 시각 (soft delete). 설정되면 모든 조회에서 제외되고 purger가 나중에 실제로 삭제
+    deleted_at: Annotated[dt.datetime | None, Field(default=None, sa_type=DateTime(timezone=True))]
\ No newline at end of file
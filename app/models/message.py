@@ -1,13 +1,86 @@
 # app/models/message.py
 
-from sqlmodel import SQLModel, Field
+from sqlalchemy import DDL, DateTime, event
+from sqlmodel import SQLModel, Field, Index
 from typing import Annotated
 from uuid import uuid4
+import datetime as dt
+import html
+import re
 
 class Message(SQLModel, table=True):
     __tablename__ = "message"
+    __table_args__ = (
+        Index("ix_message_conv_id_seq", "conv_id", "seq", unique=True),
+    )
 
     id: Annotated[str, Field(default_factory=lambda: str(uuid4()), primary_key=True)]
     conv_id: str
+    owner_id: str   # Conversation.owner_id 복사본 (검색 index를 owner 단위로 나누기 위해)
+    seq: int        # 대화 내 순번 (Conversation.last_seq에서 발급, 단조 증가)
     sender: str
-    content: str
\ No newline at end of file
+    content: str
+    token_count: int = 0    # llm.count_tokens(content), 저장 시 한 번만 계산
+    created_at: Annotated[
+        dt.datetime,
+        Field(default_factory=lambda: dt.datetime.now(dt.timezone.utc), sa_type=DateTime(timezone=True))
+    ]
+
+def search_terms(
+        text: str
+) -> list[str]:
+    """
+    검색 index/query에서 content를 나누는 단위 (소문자 단어)
+    """
+    return re.findall(r"\w+", text.lower())
+
+def search_snippet(
+        content: str,
+        terms: list[str],
+        width: int = 40
+) -> str:
+    """
+    검색 결과 snippet: 처음 일치하는 단어(terms 중 하나로 시작) 주변 (앞뒤 width 글자)
+    content는 HTML escape 한 뒤 일치 부분만 <b>...</b>로 감싼다 (client가 그대로 render 해도 안전)
+    """
+    for match in re.finditer(r"\w+", content):
+        if match.group().lower().startswith(tuple(terms)):
+            start, end = max(0, match.start() - width), min(len(content), match.end() + width)
+            return (
+                ("…" if start > 0 else "")
+                + html.escape(content[start:match.start()])
+                + f"<b>{html.escape(match.group())}</b>"
+                + html.escape(content[match.end():end])
+                + ("…" if end < len(content) else "")
+            )
+    return html.escape(content[:width * 2])
+
+# Full-text search index (create_all로 table을 만들 때 dialect별로 함께 생성)
+# 기존 PostgreSQL DB는 migrations/0006_message_search.sql, 0008_message_search_owner.sql
+# owner_id를 index에 같이 넣어 한 user의 message만 찾는다 (다른 user의 message는 읽지 않음)
+# - PostgreSQL: generated tsvector column + (owner_id, search_vector) GIN index (btree_gin)
+# - SQLite: FTS5 external content table (owner_id, content column) + trigger
+_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE message ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED",
+        "CREATE EXTENSION IF NOT EXISTS btree_gin",
+        "CREATE INDEX ix_message_owner_id_search_vector ON message USING gin (owner_id, search_vector)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE message_fts USING fts5("
+        "content, owner_id, content='message', content_rowid='rowid', tokenize='unicode61')",
+        "CREATE TRIGGER message_fts_insert AFTER INSERT ON message BEGIN "
+        "INSERT INTO message_fts(rowid, content, owner_id) VALUES (new.rowid, new.content, new.owner_id); END",
+        "CREATE TRIGGER message_fts_delete AFTER DELETE ON message BEGIN "
+        "INSERT INTO message_fts(message_fts, rowid, content, owner_id) "
+        "VALUES ('delete', old.rowid, old.content, old.owner_id); END",
+        "CREATE TRIGGER message_fts_update AFTER UPDATE OF content, owner_id ON message BEGIN "
+        "INSERT INTO message_fts(message_fts, rowid, content, owner_id) "
+        "VALUES ('delete', old.rowid, old.content, old.owner_id); "
+        "INSERT INTO message_fts(rowid, content, owner_id) VALUES (new.rowid, new.content, new.owner_id); END",
+    ],
+}
+for dialect, statements in _SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Message.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
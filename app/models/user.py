@@ -9,6 +9,6 @@ class User(SQLModel, table=True):
 
     id: Annotated[str, Field(default_factory=lambda: str(uuid4()), primary_key=True)]
     username: str
-    email: str
+    email: Annotated[str, Field(unique=True, index=True)]
     hashed_password: str
     photo_url: str | None = None
\ No newline at end of file
@@ -1,11 +1,12 @@
 # app/routers/auth.py
 
+import asyncio
 import datetime as dt
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.schemas.user import UserCreate, UserOut, Token, RefreshToken
 from app.core.security import create_access_token, create_refresh_token, get_password_hash, verify_password, decode_access_token
@@ -17,21 +18,21 @@ router = APIRouter()
 @router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def signup(
     user_in: UserCreate,
-    session: Annotated[Session, Depends(get_session)]
+    session: Annotated[AsyncSession, Depends(get_session)]
 ):
     """
     신규 사용자 회원가입 기능
     """
     # 중복 체크하기
-    existing_user = crud_user.get_user_by_email(session, user_in.email)
+    existing_user = await crud_user.get_user_by_email(session, user_in.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="User (email) already registered")
     
     # Hashing, DB에 저장
-    hashed_pw = get_password_hash(user_in.password)
+    hashed_pw = await get_password_hash(user_in.password)
 
     # User 생성
-    new_user = crud_user.create_user(
+    new_user = await crud_user.create_user(
         session=session,
         email=user_in.email,
         username=user_in.username,
@@ -49,13 +50,14 @@ async def signup(
 @router.post("/token", response_model=Token)
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Annotated[Session, Depends(get_session)]
+    session: Annotated[AsyncSession, Depends(get_session)]
 ):
     """
     토큰(OAuth2, bearer) 방식을 통한 로그인 기능
     """
-    db_user = crud_user.get_user_by_email(session, form_data.username)
-    if not db_user or not verify_password(form_data.password, db_user.hashed_password):
+    db_user = await crud_user.get_user_by_email(session, form_data.username)
+    # Google 로그인으로 가입한 user는 password가 없다
+    if not db_user or not db_user.hashed_password or not await verify_password(form_data.password, db_user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # JWT Access Token 생성
@@ -98,10 +100,17 @@ async def read_users_me(
     return current_user
 
 
+def _write_file(
+        path: str,
+        data: bytes
+) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
 @router.post("/me/photo", response_model=UserOut)
-def upload_photo(
+async def upload_photo(
     file: UploadFile = File(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user = Depends(get_current_user)
 ):
     """
@@ -109,10 +118,11 @@ def upload_photo(
     """
     path = f"static/img/{user.username}.png"
 
-    with open(path, "wb") as f:
-        f.write(file.file.read())
+    # Upload 읽기는 await, disk 쓰기는 blocking이므로 event loop 밖에서
+    data = await file.read()
+    await asyncio.to_thread(_write_file, path, data)
 
-    updated_user = crud_user.update_user_photo(session, user_id=user.id, photo_url=f"/{path}")
+    updated_user = await crud_user.update_user_photo(session, user_id=user.id, photo_url=f"/{path}")
 
     return UserOut(
         id=updated_user.id,
@@ -1,47 +1,87 @@
 # app/routers/chat.py
 
-import os, base64
+import asyncio, base64, json, time
+import datetime as dt
 
+from collections.abc import AsyncIterator
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from fastapi.responses import JSONResponse
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.requests import HTTPConnection
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.schemas.chat import ConversationOutWithFirstMessage, ConversationOut, MessageIn, MessageOut
+from app.schemas.chat import ConversationOutWithFirstMessage, ConversationOut, MessageIn, MessageOut, SearchResult
 from app.schemas.user import UserOut
-from app.dependencies import get_current_user, get_session
+from app.dependencies import get_current_user, get_session, rate_limit_user
+from app.db.database import async_session
+from app.core.configuration import settings
+from app.core.metrics import stage_seconds
+from app.core.security import decode_access_token
+from app.core.websocket import SlowConsumer, WebSocketChannel
 from app.crud import message as crud_message
 from app.crud import conversation as crud_conversation
-from app.services import stt, llm, tts
+from app.models.conversation import PREVIEW_LENGTH, Conversation
+from app.models.message import Message
+from app.services import stt, llm, tts, history, purger
 
 router = APIRouter()
 
 @router.get("/conversations", response_model=list[ConversationOut])
 async def list_conversation(
-    session: Session = Depends(get_session),
-    user = Depends(get_current_user)
+    session: AsyncSession = Depends(get_session),
+    user = Depends(get_current_user),
+    before: dt.datetime | None = None,
+    after: dt.datetime | None = None,
+    before_id: str | None = None,
+    after_id: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 50
 ):
     """
-    현재 user의 모든 대화 목록 가져오기
+    현재 user의 대화 목록 가져오기 (최신순)
+    - message_count / last_message_preview / last_sender 포함 (Message를 따로 조회할 필요 없음)
+    - before / after: last_modified 기준 cursor (이전 page의 마지막/첫 항목 값)
+    - before_id / after_id: cursor 항목의 id (같은 last_modified의 대화를 구분)
+    - cursor 이후 남은 대화가 없으면 [] (첫 page가 비어 있을 때만 404)
     """
-    conversations = crud_conversation.list_user_conversation(session, user.id)
+    conversations = await crud_conversation.list_user_conversation(
+        session, user.id, before=before, after=after, limit=limit,
+        before_id=before_id, after_id=after_id
+    )
 
-    if not conversations:
+    if not conversations and before is None and after is None:
         raise HTTPException(status_code=404, detail=f"Conversations not found")
 
     return conversations
 
 
+@router.get("/search", response_model=list[SearchResult])
+async def search_messages(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[UserOut, Depends(get_current_user)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 20,
+    offset: Annotated[int, Query(ge=0)] = 0
+):
+    """
+    현재 user의 모든 대화에서 Message 검색 (관련도 순)
+    - q의 모든 단어를 (단어 앞부분 일치로) 포함하는 Message
+    - PostgreSQL: tsvector + (owner_id, tsvector) GIN index, SQLite: FTS5, memory: owner별 inverted index
+    """
+    rows = await crud_message.search_messages(session, user.id, q, limit=limit, offset=offset)
+    return [SearchResult(**row) for row in rows]
+
+
 @router.get("/conversations/{conv_id}", response_model=ConversationOut)
 async def get_conversation(
     conv_id: str,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[UserOut, Depends(get_current_user)]
 ):
     """
     특정 대화 세션을 조회
     """
-    conversation = crud_conversation.get_conversation(session, conv_id)
+    conversation = await crud_conversation.get_conversation(session, conv_id)
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -52,74 +92,70 @@ async def get_conversation(
     return ConversationOut(
         id=conversation.id,
         title=conversation.title,
-        last_modified=conversation.last_modified
+        last_modified=conversation.last_modified,
+        message_count=conversation.message_count,
+        last_message_preview=conversation.last_message_preview,
+        last_sender=conversation.last_sender
     )
 
 
-@router.post("/conversations", response_model=ConversationOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/conversations",
+    response_model=ConversationOutWithFirstMessage,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit_user)],
+)
 async def start_conversation(
     msg_in: MessageIn,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[UserOut, Depends(get_current_user)],
-    background_tasks: BackgroundTasks
+    request: Request
 ):
     """
     새로운 대화 세션 생성
     """
     title = "Untitled"
 
-    conversation = crud_conversation.create_conversation(session, owner_id=user.id, title=title)
     # content = msg_in.content if not msg_in.voice else stt.transcribe(msg_in.voice)
 
     if msg_in.voice:
-        content = stt.transcribe_audio(msg_in.voice)
+        content = await stt.transcribe_audio(msg_in.voice)
         voice_input = True
     else:
         content = msg_in.content
         voice_input = False
 
-    first_message = crud_message.create_message(
-        session=session,
-        conv_id=conversation.id,
-        sender=user.username,
-        content=content
-    )
-
     # LLM 답변
-    assistant_response = await llm.generate_response([{"role": "user", "content": content}])
+    assistant_response = await llm.generate_response(
+        [{"role": "user", "content": content}], use_cache=not msg_in.no_cache
+    )
 
-    # Assistant(bot) Message 저장
-    assistant_message = crud_message.create_message(
-        session=session,
+    # Conversation + User/Assistant Message를 한 transaction으로 저장
+    conversation = await crud_conversation.create_conversation(session, owner_id=user.id, title=title, commit=False)
+    first_message, assistant_message = await crud_message.create_messages(
+        session,
         conv_id=conversation.id,
-        sender="assistant",
-        content=assistant_response
+        messages=[(user.username, content), ("assistant", assistant_response)]
     )
+    history.append(conversation.id, [first_message, assistant_message])
 
-    crud_conversation.update_last_modified(session, conversation.id)
-
-    # TTS
-    audio_base64 = None
-
-    if voice_input:
-        tts_file_path = tts.generate_speech(assistant_response)
-
-        # Base64 인코딩
-        with open(tts_file_path, "rb") as f:
-            audio_data = f.read()
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        
-        background_tasks.add_task(os.remove, tts_file_path)
+    # TTS: 음성은 audio_url에서 binary(audio/mpeg)로 받는다
+    audio_url = _audio_url(request, assistant_message) if voice_input else None
 
+    # 목록 정보는 create_messages의 UPDATE로 갱신되었으므로 (refresh 없이) 방금 저장한 Message로 채운다
     return ConversationOutWithFirstMessage(
         id=conversation.id,
         title=conversation.title,
-        last_modified=conversation.last_modified,
+        last_modified=assistant_message.created_at,
+        message_count=2,
+        last_message_preview=assistant_message.content[:PREVIEW_LENGTH],
+        last_sender=assistant_message.sender,
         first_message=MessageOut(
             id=first_message.id,
+            seq=first_message.seq,
             sender=first_message.sender,
             content=first_message.content,
-            audio_base64=audio_base64,
+            audio_url=audio_url,
         )
     )
 
@@ -127,13 +163,18 @@ async def start_conversation(
 @router.get("/conversations/{conv_id}/messages", response_model=list[MessageOut])
 async def list_messages(
     conv_id: str,
-    session: Annotated[Session, Depends(get_session)],
-    user: Annotated[UserOut, Depends(get_current_user)]
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[UserOut, Depends(get_current_user)],
+    before: int | None = None,
+    after: int | None = None,
+    limit: Annotated[int, Query(ge=1, le=200)] = 50
 ):
     """
-    특정 대화에 포함된 모든 Message 조회
+    특정 대화에 포함된 Message 조회 (seq 오름차순)
+    - before / after: seq 기준 cursor
+    - cursor가 없으면 가장 최근 limit개
     """
-    conversation = crud_conversation.get_conversation(session, conv_id)
+    conversation = await crud_conversation.get_conversation(session, conv_id)
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -141,21 +182,23 @@ async def list_messages(
     if conversation.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Not authorized to access this conversation")
     
-    messages = crud_message.list_messages_by_conversation(session, conv_id)
-    return [MessageOut(id=m.id, sender=m.sender, content=m.content) for m in messages]
+    messages = await crud_message.list_messages_by_conversation(
+        session, conv_id, before=before, after=after, limit=limit
+    )
+    return [MessageOut(id=m.id, seq=m.seq, sender=m.sender, content=m.content) for m in messages]
 
-@router.post("/conversations/{conv_id}/messages", response_model=MessageOut)
+@router.post("/conversations/{conv_id}/messages", response_model=MessageOut, dependencies=[Depends(rate_limit_user)])
 async def post_message(
     conv_id: str,
     msg_in: MessageIn,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_session)],
     user: Annotated[UserOut, Depends(get_current_user)],
-    background_tasks: BackgroundTasks
+    request: Request
 ):
     """
     기존 대화에 메시지를 추가하고, LLM으로부터 답변을 받아 저장
     """
-    conversation = crud_conversation.get_conversation(session, conv_id)
+    conversation = await crud_conversation.get_conversation(session, conv_id)
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -167,73 +210,423 @@ async def post_message(
     # content = msg_in.content if not msg_in.voice else stt.transcribe(msg_in.voice)
 
     if msg_in.voice:
-        content = stt.transcribe_audio(msg_in.voice)
+        content = await stt.transcribe_audio(msg_in.voice)
         voice_input = True
     else:
         content = msg_in.content
         voice_input = False
 
-    # User의 message 저장
-    user_message = crud_message.create_message(
-        session,
-        conv_id=conv_id,
-        sender=user.username,
-        content=content
-    )
-
-    # 대화의 기존 메시지 가져오기 (user/assistant 역할 기반)
-    messages = crud_message.list_messages_by_conversation(session, conv_id)
-    history = [
-        {
-            "role": "user" if m.sender == user.username else "assistant",
-            "content": m.content
-        }
-        for m in messages
-    ]
+    # 대화의 기존 메시지 가져오기 (user/assistant 역할 기반) + 이번 User message
+    # (history cache가 최신이면 DB 조회 없음, token budget을 넘는 오래된 turn은 요약으로 대체)
+    entries = await history.get_history(session, conversation)
+    context = history.build_context(conversation, entries, user.username, content)
 
     # LLM 호출 후 response 생성
-    assistant_response = await llm.generate_response(history)
+    assistant_response = await llm.generate_response(context, use_cache=not msg_in.no_cache)
 
-    # Assistant(bot) Message 저장
-    assistant_message = crud_message.create_message(
-        session=session,
+    # User/Assistant Message 저장 + 대화방 마지막 수정시간 갱신 (한 transaction)
+    user_message, assistant_message = await crud_message.create_messages(
+        session,
         conv_id=conv_id,
-        sender="assistant",
-        content=assistant_response
+        messages=[(user.username, content), ("assistant", assistant_response)]
     )
-
-    # 대화방 마지막 수정시간 갱신
-    crud_conversation.update_last_modified(session, conv_id)
+    history.append(conv_id, [user_message, assistant_message])
 
     # TTS
-    audio_base64 = None
-
-    if voice_input:
-        tts_file_path = tts.generate_speech(assistant_response)
-
-        with open(tts_file_path, "rb") as f:
-            audio_data = f.read()
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-        
-        background_tasks.add_task(os.remove, tts_file_path)
+    audio_url = _audio_url(request, assistant_message) if voice_input else None
 
     return MessageOut(
         id=assistant_message.id,
+        seq=assistant_message.seq,
         sender=assistant_message.sender,
         content=assistant_message.content,
-        audio_base64=audio_base64,
+        audio_url=audio_url,
+    )
+
+@router.post("/conversations/{conv_id}/messages/stream", dependencies=[Depends(rate_limit_user)])
+async def post_message_stream(
+    conv_id: str,
+    msg_in: MessageIn,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[UserOut, Depends(get_current_user)],
+    request: Request
+):
+    """
+    post_message의 streaming 버전 (Server-Sent Events)
+    - event: message -> 저장된 User message
+    - event: token -> LLM token (생성되는 즉시 전송)
+    - event: audio -> 음성 입력일 때, 문장 단위로 합성된 audio segment (순서대로)
+    - event: done -> 저장된 Assistant message
+    - event: error -> stream 도중 LLM/TTS가 거절된 경우 (status, detail), stream 종료
+    """
+    conversation = await crud_conversation.get_conversation(session, conv_id)
+
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if conversation.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this conversation")
+
+    if msg_in.voice:
+        content = await stt.transcribe_audio(msg_in.voice)
+        voice_input = True
+    else:
+        content = msg_in.content
+        voice_input = False
+
+    # User message는 stream 시작 전에 저장 (stream이 중간에 끊겨도 남도록)
+    context, user_message = await _start_turn(session, conversation, user.username, content)
+
+    async def event_stream():
+        yield _sse("message", _message_out(user_message))
+
+        try:
+            async for event, data in _stream_turn(conv_id, context, voice_input, use_cache=not msg_in.no_cache):
+                if event == "token":
+                    yield _sse("token", {"content": data})
+                elif event == "audio":
+                    index, segment = data
+                    with stage_seconds.time(stage="base64"):
+                        encoded = base64.b64encode(segment).decode()
+                    yield _sse("audio", {"index": index, "audio_base64": encoded})
+                else:
+                    assistant_out = _message_out(data)
+                    if voice_input:
+                        assistant_out.audio_url = _audio_url(request, data)
+                    yield _sse("done", assistant_out)
+        except HTTPException as e:
+            # 이미 200으로 응답 중이므로 status code 대신 event로 알린다
+            yield _sse("error", {"status": e.status_code, "detail": e.detail})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # proxy(nginx) buffering 방지
+        },
+    )
+
+@router.websocket("/ws/{conv_id}")
+async def chat_websocket(
+    websocket: WebSocket,
+    conv_id: str,
+    token: str | None = None
+):
+    """
+    대화 WebSocket: 연결할 때 한 번만 인증/권한 확인을 하고, 이후 turn은 같은 socket으로 주고받는다
+    - 인증: ?token=<access token> (또는 Authorization: Bearer header), 실패 시 close(1008)
+    - Client -> Server
+      - {"type": "message", "content": "...", "no_cache": false}
+      - binary frame: 음성 입력 (STT 후 message와 같이 처리)
+      - {"type": "ping"} -> {"type": "pong"}
+    - Server -> Client (turn마다 SSE endpoint와 같은 순서)
+      - {"type": "message", ...}: 저장된 User message
+      - {"type": "token", "content": ...}: LLM token
+      - {"type": "audio", "index": n} + 바로 다음 binary frame: 음성 입력일 때 audio segment (base64 없음)
+      - {"type": "done", ...}: 저장된 Assistant message
+      - {"type": "error", "status": ..., "detail": ...}: 해당 turn 실패 (429/503이면 retry_after 포함), 연결은 유지
+      - {"type": "ping"}: heartbeat (WS_HEARTBEAT_SECONDS마다)
+    - WS_IDLE_TIMEOUT_SECONDS 동안 client message가 없거나 access token이 만료되면 close
+    - 전송 queue(WS_SEND_QUEUE_SIZE)가 WS_SEND_TIMEOUT_SECONDS 넘게 비워지지 않으면 (느린 client) close(1013)
+    """
+    if token is None:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+        token = credentials if scheme.lower() == "bearer" else None
+    payload = decode_access_token(token) if token else None
+    if payload is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid Token")
+        return
+
+    async with async_session() as session:
+        try:
+            user = await get_current_user(token, session)
+        except HTTPException as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+            return
+        conversation = await crud_conversation.get_conversation(session, conv_id)
+    if not conversation:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Conversation not found")
+        return
+    if conversation.owner_id != user.id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Not authorized to access this conversation")
+        return
+
+    await websocket.accept()
+    expires_at = payload.get("exp")
+    channel = WebSocketChannel(
+        websocket,
+        send_queue_size=settings.WS_SEND_QUEUE_SIZE,
+        send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+        heartbeat=settings.WS_HEARTBEAT_SECONDS,
+        idle_timeout=settings.WS_IDLE_TIMEOUT_SECONDS,
+    )
+    async with channel:
+        try:
+            while (message := await channel.receive(deadline=expires_at)) is not None:
+                try:
+                    if message.get("bytes") is not None:
+                        await _websocket_turn(channel, websocket, conv_id, user, voice=message["bytes"])
+                        continue
+                    try:
+                        data = json.loads(message.get("text") or "")
+                    except json.JSONDecodeError:
+                        raise HTTPException(status_code=400, detail="Invalid JSON")
+                    if data.get("type") == "ping":
+                        await channel.send({"type": "pong"})
+                    elif data.get("type") == "message":
+                        try:
+                            msg_in = MessageIn.model_validate(data)
+                        except ValidationError as e:
+                            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+                        if not msg_in.content:
+                            raise HTTPException(status_code=422, detail="content is required")
+                        await _websocket_turn(channel, websocket, conv_id, user, msg_in=msg_in)
+                    else:
+                        raise HTTPException(status_code=400, detail="Unknown message type")
+                except HTTPException as e:
+                    error = {"type": "error", "status": e.status_code, "detail": e.detail}
+                    if e.headers and "Retry-After" in e.headers:
+                        error["retry_after"] = int(e.headers["Retry-After"])
+                    await channel.send(error)
+                    if e.status_code == 404:
+                        # 연결 중에 대화가 삭제됨
+                        break
+            if expires_at is not None and time.time() >= expires_at:
+                await channel.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+            else:
+                await channel.close()
+        except SlowConsumer:
+            await channel.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Client is not reading fast enough")
+        except WebSocketDisconnect:
+            pass
+
+async def _websocket_turn(
+        channel: WebSocketChannel,
+        websocket: WebSocket,
+        conv_id: str,
+        user: UserOut,
+        msg_in: MessageIn | None = None,
+        voice: bytes | None = None
+) -> None:
+    """
+    WebSocket에서 받은 message 하나를 처리 (post_message_stream과 같은 흐름)
+    권한은 연결 시 확인했으므로, 대화는 history 검증용으로만 다시 읽는다 (삭제되었으면 404)
+    """
+    await rate_limit_user(user)
+
+    if voice is not None:
+        content = await stt.transcribe_audio(voice)
+    else:
+        content = msg_in.content
+
+    async with async_session() as session:
+        conversation = await crud_conversation.get_conversation(session, conv_id)
+        if not conversation:
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        context, user_message = await _start_turn(session, conversation, user.username, content)
+    await channel.send({"type": "message", **_message_out(user_message).model_dump()})
+
+    use_cache = msg_in is None or not msg_in.no_cache
+    async for event, data in _stream_turn(conv_id, context, voice is not None, use_cache=use_cache):
+        if event == "token":
+            await channel.send({"type": "token", "content": data})
+        elif event == "audio":
+            index, segment = data
+            await channel.send({"type": "audio", "index": index}, segment)
+        else:
+            assistant_out = _message_out(data)
+            if voice is not None:
+                assistant_out.audio_url = _audio_url(websocket, data)
+            await channel.send({"type": "done", **assistant_out.model_dump()})
+
+@router.get(
+    "/conversations/{conv_id}/messages/{message_id}/audio",
+    response_class=Response,
+    responses={200: {"content": {"audio/mpeg": {}}}},
+)
+async def get_message_audio(
+    conv_id: str,
+    message_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    user: Annotated[UserOut, Depends(get_current_user)]
+):
+    """
+    Message 내용을 음성(MP3)으로 변환해 binary로 반환
+    (JSON 안의 base64 대신 audio/mpeg 응답을 그대로 사용)
+    """
+    conversation = await crud_conversation.get_conversation(session, conv_id)
+
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    if conversation.owner_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this conversation")
+
+    message = await crud_message.get_message(session, message_id)
+
+    if not message or message.conv_id != conv_id:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    # 문장 단위로 합성해서 순서대로 streaming (첫 문장이 합성되면 바로 전송 시작)
+    segments = tts.stream_speech(tts.split_sentences(message.content))
+    try:
+        first = await anext(segments)
+    except StopAsyncIteration:
+        return Response(content=b"", media_type="audio/mpeg")
+
+    async def audio_stream():
+        yield first
+        async for segment in segments:
+            yield segment
+
+    return StreamingResponse(audio_stream(), media_type="audio/mpeg")
+
+def _message_out(
+        message: Message
+) -> MessageOut:
+    return MessageOut(id=message.id, seq=message.seq, sender=message.sender, content=message.content)
+
+async def _start_turn(
+        session: AsyncSession,
+        conversation: Conversation,
+        username: str,
+        content: str
+) -> tuple[list[dict], Message]:
+    """
+    Streaming turn 준비: LLM context 구성 + User message 저장
+    """
+    entries = await history.get_history(session, conversation)
+    context = history.build_context(conversation, entries, username, content)
+    user_message = await crud_message.create_message(
+        session,
+        conv_id=conversation.id,
+        sender=username,
+        content=content
     )
+    history.append(conversation.id, [user_message])
+    return context, user_message
+
+async def _stream_turn(
+        conv_id: str,
+        context: list[dict],
+        voice_input: bool,
+        use_cache: bool
+) -> AsyncIterator[tuple[str, object]]:
+    """
+    LLM 답변을 stream하고 끝나면 Assistant message 저장 (SSE / WebSocket 공용)
+    - ("token", str): LLM token (생성되는 즉시)
+    - ("audio", (index, bytes)): 음성 입력일 때, 문장 단위로 합성된 audio segment (순서대로)
+    - ("done", Message): 저장된 Assistant message
+    LLM/TTS가 거절하면 HTTPException (Assistant message는 저장하지 않음)
+    """
+    tokens = []
+    # 음성 입력이면 문장이 완성되는 대로 TTS를 시작해 audio segment를 token과 함께 보낸다
+    sentences: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def token_events():
+        splitter = tts.SentenceSplitter()
+        async for token in llm.stream_response(context, use_cache=use_cache):
+            tokens.append(token)
+            if voice_input:
+                for sentence in splitter.feed(token):
+                    sentences.put_nowait(sentence)
+            yield "token", token
+        if voice_input:
+            if rest := splitter.flush():
+                sentences.put_nowait(rest)
+            sentences.put_nowait(None)
+
+    async def audio_events():
+        async def completed_sentences():
+            while (sentence := await sentences.get()) is not None:
+                yield sentence
+
+        index = 0
+        async for segment in tts.stream_speech(completed_sentences()):
+            yield "audio", (index, segment)
+            index += 1
+
+    streams = [token_events(), audio_events()] if voice_input else [token_events()]
+    async for event in _merge(*streams):
+        yield event
+
+    # Stream이 끝난 뒤 Assistant(bot) Message 저장
+    # (Dependency session은 response 전송 중 닫힐 수 있으므로 별도 session 사용)
+    async with async_session() as stream_session:
+        assistant_message = await crud_message.create_message(
+            stream_session,
+            conv_id=conv_id,
+            sender="assistant",
+            content="".join(tokens)
+        )
+    history.append(conv_id, [assistant_message])
+    yield "done", assistant_message
+
+def _audio_url(
+        request: HTTPConnection,
+        message: Message
+) -> str:
+    """
+    Message 음성을 받을 수 있는 URL
+    """
+    return str(request.url_for("get_message_audio", conv_id=message.conv_id, message_id=message.id))
+
+async def _merge(
+        *streams: AsyncIterator
+) -> AsyncIterator:
+    """
+    여러 async iterator의 item을 생성되는 순서대로 하나의 stream으로 합친다
+    queue 크기가 1이므로 소비 측(SSE 응답 / WebSocketChannel.send)이 느리면 stream들도 기다린다 (backpressure)
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    done = object()
+
+    async def drain(stream: AsyncIterator[str]):
+        # 취소(CancelledError)된 경우에는 더 넣지 않는다 (가득 찬 queue에서 기다리며 남지 않도록)
+        try:
+            async for item in stream:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(done)
+
+    tasks = [asyncio.create_task(drain(stream)) for stream in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+def _sse(
+        event: str,
+        data: BaseModel | dict
+) -> str:
+    """
+    Server-Sent Event 한 건을 직렬화
+    """
+    payload = data.model_dump_json() if isinstance(data, BaseModel) else json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
 
 @router.delete("/conversations/{conv_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_conversation(
+async def delete_conversation(
     conv_id: str,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user = Depends(get_current_user)
 ):
     """
     Conversation과 대화 내부의 모든 message 삭제
     """
-    conversation = crud_conversation.get_conversation(session, conv_id)
+    conversation = await crud_conversation.get_conversation(session, conv_id)
 
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -241,11 +634,11 @@ def delete_conversation(
     if conversation.owner_id != user.id:
         raise HTTPException(status_code=403, detail="Permission denied")
     
-    # Message 삭제
-    crud_message.delete_messages_by_conversation(session, conv_id)
-
-    # Conversation 삭제
-    crud_conversation.delete_conversation(session, conv_id)
+    # Conversation 삭제 표시 (즉시 모든 조회에서 제외)
+    # Message와 Conversation row는 purger가 background에서 batch 단위로 삭제
+    await crud_conversation.mark_deleted(session, conv_id)
+    history.invalidate(conv_id)
+    purger.notify()
 
     return JSONResponse(
         status_code=200,
@@ -1,13 +1,17 @@
 # app/routers/google_auth.py
 
-from fastapi import APIRouter, HTTPException
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from google.oauth2 import id_token
 from google.auth.transport import requests
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.configuration import settings
 from app.core.security import create_access_token
-from app.db import fake_db
+from app.crud import user as crud_user
+from app.dependencies import get_session
 
 router = APIRouter()
 
@@ -15,7 +19,10 @@ class TokenIn(BaseModel):
     id_token: str
 
 @router.post("/verify")
-async def verify_id_token(payload: TokenIn):
+async def verify_id_token(
+    payload: TokenIn,
+    session: Annotated[AsyncSession, Depends(get_session)]
+):
     """
     Google 인증 방식
     """
@@ -31,9 +38,18 @@ async def verify_id_token(payload: TokenIn):
     username = info["email"]
     photo = info.get("picture")
 
-    user = fake_db.get_user(username) or fake_db.add_user(username, hashed_password="", photo_url=photo)
-    if photo and user.get("photo_url") != photo:
-        fake_db.update_user_photo(username, photo)
+    user = await crud_user.get_user_by_email(session, username)
+    if user is None:
+        # Google 계정은 password 없이 가입 (password login 불가)
+        user = await crud_user.create_user(
+            session,
+            username=info.get("name") or username,
+            email=username,
+            hashed_password="",
+            photo_url=photo,
+        )
+    elif photo and user.photo_url != photo:
+        await crud_user.update_user_photo(session, user.id, photo)
     
     jwt = create_access_token({"sub": username})
     return {"jwt": jwt, "username": username, "photo_url": photo}
\ No newline at end of file
@@ -1,5 +1,6 @@
 # app/schemas/chat.py
 
+import datetime as dt
 from typing import Annotated
 from pydantic import BaseModel, Field
 
@@ -9,20 +10,31 @@ class ConversationCreate(BaseModel):
 class ConversationOut(BaseModel):
     id: str
     title: str
-    last_modified: str # ISO8601
+    last_modified: dt.datetime # ISO8601 (timestamptz)
+    message_count: int = 0
+    last_message_preview: str | None = None     # 마지막 Message 앞부분
+    last_sender: str | None = None
 
 class MessageIn(BaseModel):
     content: Annotated[str, Field(None, example="Hello, how are you?")]
     voice: bytes | None = None
+    no_cache: bool = False     # True면 cache된 LLM 답변을 쓰지 않고 항상 새로 생성
 
 class MessageOut(BaseModel):
     id: str
+    seq: int
     sender: str
     content: str
-    audio_base64: str | None = None
+    audio_url: str | None = None     # 음성 응답(audio/mpeg)을 받을 URL
 
-class ConversationOutWithFirstMessage(BaseModel):
-    id: str
-    title: str
-    last_modified: str
+class SearchResult(BaseModel):
+    conv_id: str
+    conversation_title: str
+    message_id: str
+    seq: int
+    sender: str
+    snippet: str    # HTML escape 된 text, 일치하는 부분만 <b>...</b>
+    score: float    # 클수록 관련도가 높음 (backend마다 척도가 다름)
+
+class ConversationOutWithFirstMessage(ConversationOut):
     first_message: MessageOut
\ No newline at end of file
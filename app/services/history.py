@@ -0,0 +1,193 @@
+# app/services/history.py
+
+"""
+Conversation history cache (LLM context 구성용, in-process LRU)
+- 대화 history는 append만 되므로 (seq, sender, content)를 대화별로 cache하고,
+  새 Message를 저장할 때 cache 끝에 이어 붙인다
+- 조회 시 이미 읽은 Conversation.last_seq와 비교해 검증하고,
+  다른 worker가 추가한 Message가 있으면 seq > (cache의 마지막 seq)만 가져온다
+- 대화 삭제 시 invalidate
+
+build_context: CONTEXT_TOKEN_BUDGET 안에서 최근 turn을 고르고,
+잘려 나간 오래된 turn은 Conversation.summary(rolling summary)로 대신한다.
+요약은 background에서 새로 잘려 나간 turn만 반영해 갱신된다.
+"""
+
+import asyncio
+import logging
+from typing import NamedTuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.configuration import settings
+from app.crud import conversation as crud_conversation
+from app.crud import message as crud_message
+from app.db.database import async_session
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services import llm
+
+logger = logging.getLogger(__name__)
+
+class HistoryEntry(NamedTuple):
+    seq: int
+    sender: str
+    content: str
+    token_count: int
+
+def _sizeof(
+        entries: tuple[HistoryEntry, ...]
+) -> int:
+    return sum(len(entry.content) + len(entry.sender) for entry in entries)
+
+history_cache = LRUCache(
+    "history",
+    maxsize=settings.HISTORY_CACHE_SIZE,
+    max_bytes=settings.HISTORY_CACHE_MAX_BYTES,
+    sizeof=_sizeof,
+)
+
+def _entries(
+        messages: list[Message]
+) -> tuple[HistoryEntry, ...]:
+    return tuple(HistoryEntry(m.seq, m.sender, m.content, m.token_count) for m in messages)
+
+async def get_history(
+        session: AsyncSession,
+        conversation: Conversation
+) -> tuple[HistoryEntry, ...]:
+    """
+    Conversation의 전체 history (seq 오름차순)
+    cache가 최신이면 DB를 조회하지 않는다
+    """
+    generation = history_cache.generation
+    cached = history_cache.get(conversation.id)
+    last_seq = cached[-1].seq if cached else 0
+
+    if cached is not None and last_seq == conversation.last_seq:
+        return cached
+
+    if cached is not None and last_seq < conversation.last_seq:
+        # 다른 worker에서 추가된 Message만 가져오기
+        messages = await crud_message.list_messages_by_conversation(session, conversation.id, after=last_seq)
+        entries = cached + _entries(messages)
+    else:
+        messages = await crud_message.list_messages_by_conversation(session, conversation.id)
+        entries = _entries(messages)
+
+    history_cache.set(conversation.id, entries, generation=generation)
+    return entries
+
+def append(
+        conv_id: str,
+        messages: list[Message]
+) -> None:
+    """
+    새로 저장된 Message를 cache에 이어 붙이기
+    cache의 마지막 seq와 이어지지 않으면 (다른 worker가 먼저 추가) 그대로 두고 다음 조회에서 보충
+    """
+    if not messages:
+        return
+    generation = history_cache.generation
+    # peek: 쓰기 경로의 조회는 hit rate(context 구성 시의 조회)에 넣지 않는다
+    cached = history_cache.peek(conv_id)
+    if cached is None:
+        # 새 대화는 처음부터 cache에 올린다
+        if messages[0].seq == 1:
+            history_cache.set(conv_id, _entries(messages), generation=generation)
+        return
+    last_seq = cached[-1].seq if cached else 0
+    if last_seq + 1 != messages[0].seq:
+        return
+    history_cache.set(conv_id, cached + _entries(messages), generation=generation)
+
+def invalidate(
+        conv_id: str
+) -> None:
+    history_cache.invalidate(conv_id)
+
+_SUMMARY_PREFIX = "이전 대화 요약:\n"
+
+def build_context(
+        conversation: Conversation,
+        entries: tuple[HistoryEntry, ...],
+        username: str,
+        content: str
+) -> list[dict]:
+    """
+    LLM에 보낼 messages 구성 (CONTEXT_TOKEN_BUDGET 이내)
+    - 전체 history가 budget에 들어가면 그대로
+    - 아니면 SUMMARY_MAX_TOKENS를 요약 몫으로 남기고 최근 turn부터 채운 뒤,
+      앞에 저장된 요약을 붙이고 요약 갱신을 background로 예약
+    """
+    def role(entry: HistoryEntry) -> str:
+        return "user" if entry.sender == username else "assistant"
+
+    budget = settings.CONTEXT_TOKEN_BUDGET - llm.count_tokens(content)
+    if sum(entry.token_count for entry in entries) <= budget:
+        start = 0
+    else:
+        budget -= settings.SUMMARY_MAX_TOKENS + llm.count_tokens(_SUMMARY_PREFIX)
+        start = len(entries)
+        while start > 0 and entries[start - 1].token_count <= budget:
+            budget -= entries[start - 1].token_count
+            start -= 1
+
+    context = []
+    if start > 0:
+        if conversation.summary:
+            context.append({"role": "system", "content": _SUMMARY_PREFIX + conversation.summary})
+        dropped = [entry for entry in entries[:start] if entry.seq > conversation.summary_upto_seq]
+        if dropped and (
+            not conversation.summary
+            or sum(entry.token_count for entry in dropped) >= settings.SUMMARY_REFRESH_MIN_TOKENS
+        ):
+            _schedule_summary(
+                conversation.id,
+                conversation.summary,
+                [{"role": role(entry), "content": entry.content} for entry in dropped],
+                upto_seq=dropped[-1].seq,
+            )
+
+    context += [{"role": role(entry), "content": entry.content} for entry in entries[start:]]
+    context.append({"role": "user", "content": content})
+    return context
+
+# 진행 중인 요약 갱신 (대화당 하나만, task 참조 유지)
+_summarizing: dict[str, asyncio.Task] = {}
+
+def _schedule_summary(
+        conv_id: str,
+        summary: str | None,
+        messages: list[dict],
+        upto_seq: int
+) -> None:
+    if conv_id in _summarizing:
+        return
+    task = asyncio.create_task(_refresh_summary(conv_id, summary, messages, upto_seq))
+    _summarizing[conv_id] = task
+    task.add_done_callback(lambda _: _summarizing.pop(conv_id, None))
+
+async def drain() -> None:
+    """
+    진행 중인 요약 갱신이 끝날 때까지 대기 (lifespan 종료 시, DB 호출 도중에 취소하지 않도록)
+    """
+    while _summarizing:
+        await asyncio.gather(*_summarizing.values(), return_exceptions=True)
+
+async def _refresh_summary(
+        conv_id: str,
+        summary: str | None,
+        messages: list[dict],
+        upto_seq: int
+) -> None:
+    """
+    이전 요약에 새로 잘려 나간 turn만 더해 요약 갱신 (incremental)
+    """
+    try:
+        new_summary = await llm.summarize(summary, messages)
+        async with async_session() as session:
+            await crud_conversation.update_summary(session, conv_id, new_summary, upto_seq)
+    except Exception:
+        logger.exception("Summary refresh failed (conversation %s)", conv_id)
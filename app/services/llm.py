@@ -1,6 +1,100 @@
 # app/services/llm.py
 
+import asyncio
+import contextlib
+import hashlib
+import json
+import re
+import unicodedata
+from collections.abc import AsyncIterator
+
+from app.core.cache import LRUCache
+from app.core import limiter
 from app.core.configuration import settings
+from app.core.metrics import stage_seconds
+
+def _slot():
+    """
+    LLM 동시 호출 slot (LLM_MAX_CONCURRENCY, 대기 queue가 차면 503)
+    """
+    if limiter.llm_slots is None:
+        return contextlib.nullcontext()
+    return limiter.llm_slots.slot()
+
+def count_tokens(text: str) -> int:
+    """
+    Token 수 추정 (UTF-8 4 bytes당 1 token)
+    tokenizer 없이 한국어/영어 혼합 text에 쓸 수 있는 근사치 (migration의 backfill과 같은 식)
+    """
+    return (len(text.encode("utf-8")) + 3) // 4
+
+# 같은 질문(정규화한 prompt) + 같은 앞선 context에 대한 답변 cache
+response_cache = LRUCache(
+    "llm",
+    maxsize=settings.LLM_CACHE_SIZE,
+    ttl=settings.LLM_CACHE_TTL_SECONDS,
+    max_bytes=settings.LLM_CACHE_MAX_BYTES,
+    sizeof=lambda response: len(response.encode("utf-8")),
+)
+
+def normalize_prompt(text: str) -> str:
+    """
+    Cache key용 prompt 정규화: NFKC, 대소문자, 연속 공백 차이를 무시
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+def cache_key(messages: list[dict]) -> tuple[str, str]:
+    """
+    (마지막 message의 정규화된 prompt, 앞선 context의 hash)
+    """
+    *context, prompt = messages
+    payload = json.dumps(context, sort_keys=True, ensure_ascii=False)
+    return normalize_prompt(prompt["content"]), hashlib.sha256(payload.encode()).hexdigest()
+
+async def generate_response(
+        messages: list[dict],
+        use_cache: bool = True
+) -> str:
+    """
+    LLM 답변 생성
+    use_cache: 같은 prompt/context의 답변이 cache에 있으면 model을 호출하지 않고 반환
+    (LLM_CACHE_SIZE=0이면 항상 model 호출)
+    """
+    use_cache = use_cache and settings.LLM_CACHE_SIZE > 0
+    if use_cache:
+        key = cache_key(messages)
+        generation = response_cache.generation
+        if (response := response_cache.get(key)) is not None:
+            return response
+
+    async with _slot():
+        with stage_seconds.time(stage="llm"):
+            response = f"Response From LLM: {messages}"
+
+    if use_cache and len(response.encode("utf-8")) <= settings.LLM_CACHE_MAX_ENTRY_BYTES:
+        response_cache.set(key, response, generation=generation)
+    return response
+
+async def summarize(summary: str | None, messages: list[dict]) -> str:
+    """
+    이전 요약 + 새 message -> 갱신된 요약 (SUMMARY_MAX_TOKENS 이내)
+    (stub: 최근 내용을 남기고 앞부분을 자른다)
+    """
+    async with _slot():
+        lines = [summary] if summary else []
+        lines += [f"{m['role']}: {m['content']}" for m in messages]
+        text = "\n".join(lines).encode("utf-8")
+        return text[-settings.SUMMARY_MAX_TOKENS * 4:].decode("utf-8", errors="ignore")
 
-async def generate_response(messages: list[dict]) -> str:
-    return f"Response From LLM: {messages}"
\ No newline at end of file
+async def stream_response(
+        messages: list[dict],
+        use_cache: bool = True
+) -> AsyncIterator[str]:
+    """
+    LLM 답변을 token 단위로 생성 (async generator)
+    token이 생성되는 즉시 yield 하므로, 호출 측에서 바로 flush 할 수 있다
+    """
+    response = await generate_response(messages, use_cache=use_cache)
+    for token in re.findall(r"\S+\s*", response):
+        yield token
+        await asyncio.sleep(0)
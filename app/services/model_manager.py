@@ -0,0 +1,124 @@
+# app/services/model_manager.py
+
+"""
+추론 model(Whisper 등)의 lifecycle 관리
+- 첫 사용 시 load (import만으로는 load하지 않음)
+- lifespan에서 opt-in warm-up (settings.MODEL_WARMUP)
+- 일정 시간(settings.MODEL_IDLE_TTL_SECONDS) 사용되지 않으면 unload 해서 memory 반환
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+class ManagedModel:
+    def __init__(
+            self,
+            name: str,
+            loader: Callable[[], Any],
+            idle_ttl: float = 0
+    ):
+        self.name = name
+        self.idle_ttl = idle_ttl   # 0이면 unload 하지 않음
+        self._loader = loader
+        self._model: Any = None
+        self._users = 0
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> Any:
+        """
+        Model load (이미 load 되어 있으면 그대로 반환, blocking)
+        """
+        with self._lock:
+            if self._model is None:
+                self._model = self._loader()
+            self._last_used = time.monotonic()
+            return self._model
+
+    @contextmanager
+    def use(self) -> Iterator[Any]:
+        """
+        with model.use() as m: ...
+        사용 중에는 idle unload 대상이 되지 않는다
+        """
+        with self._lock:
+            self._users += 1
+        try:
+            yield self.load()
+        finally:
+            with self._lock:
+                self._users -= 1
+                self._last_used = time.monotonic()
+
+    def unload_if_idle(self) -> bool:
+        """
+        idle_ttl 넘게 사용되지 않았으면 unload
+        load 중(lock 사용 중)이면 기다리지 않고 건너뛴다 (다음 주기에 다시 확인)
+        """
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if (
+                self._model is None
+                or self.idle_ttl <= 0
+                or self._users > 0
+                or time.monotonic() - self._last_used < self.idle_ttl
+            ):
+                return False
+            model, self._model = self._model, None
+        finally:
+            self._lock.release()
+        # 큰 model의 해제는 lock 밖에서
+        del model
+        return True
+
+    def status(self) -> dict:
+        return {"loaded": self.loaded, "in_use": self._users}
+
+
+_registry: dict[str, ManagedModel] = {}
+_warmed_up = False
+
+def register(
+        name: str,
+        loader: Callable[[], Any],
+        idle_ttl: float = 0
+) -> ManagedModel:
+    model = ManagedModel(name, loader, idle_ttl)
+    _registry[name] = model
+    return model
+
+async def warm_up() -> None:
+    """
+    등록된 model을 미리 load (worker thread에서 실행하므로 liveness는 막지 않는다)
+    """
+    global _warmed_up
+    for model in _registry.values():
+        await asyncio.to_thread(model.load)
+    _warmed_up = True
+
+async def reap_idle(
+        interval: float
+) -> None:
+    """
+    주기적으로 idle model을 unload (lifespan에서 background task로 실행)
+    model 해제는 blocking일 수 있으므로 worker thread에서 실행한다
+    """
+    while True:
+        await asyncio.sleep(interval)
+        for model in _registry.values():
+            await asyncio.to_thread(model.unload_if_idle)
+
+def is_warmed_up() -> bool:
+    return _warmed_up
+
+def status() -> dict[str, dict]:
+    return {name: model.status() for name, model in _registry.items()}
@@ -0,0 +1,78 @@
+# app/services/purger.py
+
+"""
+삭제 표시(soft delete)된 Conversation을 background에서 실제로 삭제
+- Message는 PURGE_BATCH_SIZE개씩 set-based DELETE 후 batch마다 commit
+  (큰 대화도 짧은 transaction 여러 개로 나누어 lock을 오래 잡지 않는다)
+- Message가 모두 지워지면 Conversation row 삭제
+- 종료 시(stop) 진행 중인 batch를 commit 한 뒤 멈춘다 (DB 호출 도중에 취소하지 않음)
+  남은 대화는 다음 시작 때 이어서 purge 된다
+"""
+
+import asyncio
+import logging
+
+from app.core.configuration import settings
+from app.crud import conversation as crud_conversation
+from app.crud import message as crud_message
+from app.db.database import async_session
+
+logger = logging.getLogger(__name__)
+
+_wakeup = asyncio.Event()
+_stop = asyncio.Event()
+
+def notify() -> None:
+    """
+    새로 삭제 표시된 대화가 있음을 알림 (다음 주기를 기다리지 않고 바로 purge)
+    """
+    _wakeup.set()
+
+def stop() -> None:
+    """
+    run 종료 요청 (lifespan 종료 시, 현재 batch가 끝나면 run이 return)
+    """
+    _stop.set()
+    _wakeup.set()
+
+async def purge_once(
+        batch_size: int,
+        max_conversations: int = 100
+) -> int:
+    """
+    삭제 표시된 대화를 purge
+    Return: purge 된 Conversation 수
+    """
+    purged = 0
+    async with async_session() as session:
+        conv_ids = await crud_conversation.list_deleted_conversation_ids(session, limit=max_conversations)
+        for conv_id in conv_ids:
+            while await crud_message.delete_messages_by_conversation(session, conv_id, batch_size):
+                await session.commit()
+                if _stop.is_set():
+                    return purged
+                await asyncio.sleep(0)   # batch 사이에 다른 요청이 처리될 수 있도록
+            await crud_conversation.delete_conversation(session, conv_id)
+            purged += 1
+            if _stop.is_set():
+                break
+    return purged
+
+async def run(
+        interval: float
+) -> None:
+    """
+    주기적으로(또는 notify 시 즉시) purge (lifespan에서 background task로 실행, stop 시 return)
+    """
+    _stop.clear()
+    while not _stop.is_set():
+        _wakeup.clear()
+        try:
+            while not _stop.is_set() and await purge_once(settings.PURGE_BATCH_SIZE):
+                pass
+        except Exception:
+            logger.exception("Conversation purge failed")
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
@@ -1,25 +1,63 @@
 # app/services/stt.py
 
-import tempfile, os, shutil
-from faster_whisper import WhisperModel
+import io
 
-model = WhisperModel("base")
+from app.core.configuration import settings
+from app.core.executor import BoundedExecutor
+from app.core.metrics import stage_seconds
+from app.services import model_manager, stt_server
 
-def transcribe_audio(upload_file) -> str:
+def _load_whisper():
+    # faster_whisper import 자체도 무거우므로 load 시점까지 미룬다
+    from faster_whisper import WhisperModel
+    return WhisperModel("base")
+
+# 첫 transcription (또는 warm-up) 때 load
+# STT_SERVER_SOCKET이 설정되면 model은 stt_server process가 가지고, 이 process는 client로만 동작
+whisper = model_manager.register("whisper", _load_whisper, idle_ttl=settings.MODEL_IDLE_TTL_SECONDS)
+
+# Whisper 추론은 수 초간 CPU를 점유하므로 event loop 밖의 bounded pool에서 실행
+executor = BoundedExecutor(
+    name="stt",
+    max_workers=settings.STT_MAX_WORKERS,
+    max_queue=settings.STT_MAX_QUEUE,
+    timeout=settings.STT_TIMEOUT_SECONDS,
+)
+
+async def transcribe_audio(audio: bytes) -> str:
     """
-    Input: Audio File
+    Input: Audio (bytes)
     Output: String
 
-    Audio File -> Temporary File (wav/mp3)\
+    Audio bytes -> in-memory buffer
     -> STT API (or opensource) -> return text
     """
-    suffix = os.path.splitext(upload_file.filename)[1]
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        shutil.copyfileobj(upload_file.file, tmp)
-        tmp_path = tmp.name
+    with stage_seconds.time(stage="stt"):
+        if settings.STT_BACKEND == "fake":
+            # Model 없이 동작하는 local STT (test, benchmark용): audio bytes를 UTF-8 text로 간주
+            return audio.decode("utf-8", errors="replace")
 
-    segments, _ = model.transcribe(tmp_path, beam_size=5)
-    text = " ".join([seg.text for seg in segments])
+        if settings.STT_SERVER_SOCKET:
+            return await stt_server.transcribe(settings.STT_SERVER_SOCKET, audio, timeout=settings.STT_TIMEOUT_SECONDS)
+
+        return await executor.run(transcribe_bytes, audio)
 
-    os.remove(tmp_path)
+def transcribe_bytes(audio: bytes) -> str:
+    """
+    transcribe_audio의 blocking 부분 (worker thread에서 실행)
+    임시 파일 없이 memory buffer를 그대로 model에 넘긴다
+    """
+    with whisper.use() as model:
+        return run_transcription(model, io.BytesIO(audio))
+
+def run_transcription(
+        whisper_model,
+        audio
+) -> str:
+    """
+    Whisper 추론 (blocking)
+    audio: 파일 경로 또는 binary file-like object
+    """
+    segments, _ = whisper_model.transcribe(audio, beam_size=5)
+    text = " ".join([seg.text for seg in segments])
     return text.strip()
\ No newline at end of file
@@ -0,0 +1,138 @@
+# app/services/stt_server.py
+
+"""
+Local STT model server
+여러 uvicorn worker가 Whisper model 하나를 공유하도록, model을 가진 별도 process가
+Unix socket으로 transcription 요청을 처리한다.
+
+실행: STT_SERVER_SOCKET=/tmp/stt.sock python -m app.services.stt_server
+API server도 같은 STT_SERVER_SOCKET을 설정하면 stt.transcribe_audio가 이 server의 client로 동작한다.
+
+Protocol (요청/응답 모두 4-byte big-endian 길이 + payload)
+- 요청: audio bytes
+- 응답: JSON {"text": ...} 또는 {"error": ..., "status": ...}
+"""
+
+import asyncio
+import json
+import os
+import struct
+
+from fastapi import HTTPException, status
+
+from app.core.configuration import settings
+from app.core.executor import BoundedExecutor
+from app.services import model_manager
+
+_HEADER = struct.Struct("!I")
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+async def read_frame(
+        reader: asyncio.StreamReader
+) -> bytes:
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_AUDIO_BYTES:
+        raise ValueError(f"Frame too large: {length} bytes")
+    return await reader.readexactly(length)
+
+def write_frame(
+        writer: asyncio.StreamWriter,
+        payload: bytes
+) -> None:
+    writer.write(_HEADER.pack(len(payload)) + payload)
+
+async def transcribe(
+        socket_path: str,
+        audio: bytes,
+        timeout: float
+) -> str:
+    """
+    Client: model server에 audio를 보내고 text를 받는다
+    """
+    try:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    except OSError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="STT server is unavailable",
+            headers={"Retry-After": "1"},
+        )
+
+    try:
+        write_frame(writer, audio)
+        await writer.drain()
+        response = json.loads(await asyncio.wait_for(read_frame(reader), timeout=timeout))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="stt timed out")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="STT server closed the connection",
+        )
+    finally:
+        writer.close()
+
+    if "error" in response:
+        raise HTTPException(status_code=response.get("status", 500), detail=response["error"])
+    return response["text"]
+
+async def serve(
+        socket_path: str
+) -> None:
+    """
+    Server: model을 한 번만 load하고 Unix socket으로 요청을 처리
+    """
+    from app.services.stt import transcribe_bytes, whisper
+
+    # model은 이 process에서만 load (server 시작 시 warm-up, idle 시 unload)
+    await asyncio.to_thread(whisper.load)
+    if whisper.idle_ttl > 0:
+        reaper = asyncio.create_task(model_manager.reap_idle(whisper.idle_ttl / 2))
+
+    executor = BoundedExecutor(
+        name="stt",
+        max_workers=settings.STT_MAX_WORKERS,
+        max_queue=settings.STT_MAX_QUEUE,
+        timeout=settings.STT_TIMEOUT_SECONDS,
+    )
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    audio = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                except ValueError as e:
+                    write_frame(writer, json.dumps({"error": str(e), "status": 413}).encode())
+                    await writer.drain()
+                    break
+
+                try:
+                    text = await executor.run(transcribe_bytes, audio)
+                    response = {"text": text}
+                except HTTPException as e:
+                    response = {"error": e.detail, "status": e.status_code}
+                except Exception as e:
+                    response = {"error": f"Transcription failed: {e}", "status": 500}
+
+                write_frame(writer, json.dumps(response, ensure_ascii=False).encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    server = await asyncio.start_unix_server(handle, path=socket_path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    if not settings.STT_SERVER_SOCKET:
+        raise SystemExit("STT_SERVER_SOCKET is not set")
+    asyncio.run(serve(settings.STT_SERVER_SOCKET))
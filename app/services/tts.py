@@ -1,19 +1,197 @@
 # app/services/tts.py
 
-from gtts import gTTS
-import tempfile, os
+import asyncio
+import hashlib
+import io
+import json
+import re
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 
-def generate_speech(
+from app.core.cache import DiskCache, LRUCache
+from app.core.configuration import settings
+from app.core.executor import BoundedExecutor
+from app.core.metrics import stage_seconds
+
+class GTTSBackend:
+    """
+    Google TTS (gTTS)
+    """
+    def __init__(
+            self,
+            lang: str,
+            tld: str = "com",
+            slow: bool = False
+    ):
+        self.lang = lang
+        self.tld = tld
+        self.slow = slow
+
+    @property
+    def params(self) -> dict:
+        """
+        합성 결과에 영향을 주는 parameter (cache key에 포함)
+        """
+        return {"backend": "gtts", "lang": self.lang, "tld": self.tld, "slow": self.slow}
+
+    def synthesize(
+            self,
+            text: str
+    ) -> bytes:
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang=self.lang, tld=self.tld, slow=self.slow)
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+class FakeTTSBackend:
+    """
+    Network 없이 동작하는 local TTS (test, benchmark용)
+    text에 대해 결정적인 bytes를 반환하고 호출 횟수를 기록한다
+    """
+    def __init__(
+            self,
+            lang: str
+    ):
+        self.lang = lang
+        self.calls = 0
+
+    @property
+    def params(self) -> dict:
+        return {"backend": "fake", "lang": self.lang}
+
+    def synthesize(
+            self,
+            text: str
+    ) -> bytes:
+        self.calls += 1
+        return b"ID3" + hashlib.sha256(text.encode()).digest()
+
+def _create_backend():
+    if settings.TTS_BACKEND == "fake":
+        return FakeTTSBackend(lang=settings.TTS_LANG)
+    return GTTSBackend(lang=settings.TTS_LANG, tld=settings.TTS_TLD)
+
+backend = _create_backend()
+
+# gTTS는 blocking HTTP 호출이므로 event loop 밖의 bounded pool에서 실행
+executor = BoundedExecutor(
+    name="tts",
+    max_workers=settings.TTS_MAX_WORKERS,
+    max_queue=settings.TTS_MAX_QUEUE,
+    timeout=settings.TTS_TIMEOUT_SECONDS,
+)
+
+# 합성 결과 cache: memory(LRU, 크기 제한) -> disk(선택, 크기 기반 eviction)
+memory_cache = LRUCache("tts", maxsize=10_000, max_bytes=settings.TTS_CACHE_MAX_BYTES)
+disk_cache = (
+    DiskCache("tts_disk", settings.TTS_CACHE_DIR, max_bytes=settings.TTS_CACHE_DISK_MAX_BYTES)
+    if settings.TTS_CACHE_DIR else None
+)
+
+def cache_key(
         text: str
 ) -> str:
     """
-    Text -> String 변환
-    Return: 파일 경로로
+    (text, lang, voice parameter)의 hash
+    """
+    payload = json.dumps([text, backend.params], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+async def generate_speech(
+        text: str
+) -> bytes:
+    """
+    Text -> Speech 변환
+    Return: MP3 audio (bytes, 디스크를 거치지 않음)
+    같은 text/voice 조합은 cache에서 반환하고 합성하지 않는다
+    """
+    key = cache_key(text)
+
+    audio = memory_cache.get(key)
+    if audio is not None:
+        return audio
+
+    if disk_cache is not None:
+        audio = await asyncio.to_thread(disk_cache.get, key)
+        if audio is not None:
+            memory_cache.set(key, audio)
+            return audio
+
+    with stage_seconds.time(stage="tts"):
+        audio = await executor.run(backend.synthesize, text)
+
+    memory_cache.set(key, audio)
+    if disk_cache is not None:
+        await asyncio.to_thread(disk_cache.set, key, audio)
+    return audio
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+def split_sentences(
+        text: str
+) -> list[str]:
+    """
+    문장 단위로 분리 (문장부호 + 공백, 또는 줄바꿈 기준)
     """
-    tts = gTTS(text=text, lang="kr")
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-    tmp_path = tmp_file.name
+    return [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+class SentenceSplitter:
+    """
+    LLM token stream을 받아 완성된 문장부터 돌려주는 incremental splitter
+    """
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(
+            self,
+            token: str
+    ) -> list[str]:
+        self._buffer += token
+        parts = _SENTENCE_END.split(self._buffer)
+        # 마지막 조각은 아직 끝나지 않은 문장
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self) -> str | None:
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+async def stream_speech(
+        sentences: Iterable[str] | AsyncIterable[str]
+) -> AsyncIterator[bytes]:
+    """
+    문장별로 합성한 audio를 순서대로 yield
+    - 문장이 들어오는 즉시 합성을 시작하고, 최대 TTS_PIPELINE_DEPTH개를 동시에 합성
+    - 첫 문장의 합성이 끝나면 바로 첫 audio segment를 내보낸다
+    """
+    pending: asyncio.Queue[asyncio.Task | None] = asyncio.Queue(maxsize=settings.TTS_PIPELINE_DEPTH)
+
+    async def produce():
+        try:
+            if isinstance(sentences, AsyncIterable):
+                async for sentence in sentences:
+                    await pending.put(asyncio.create_task(generate_speech(sentence)))
+            else:
+                for sentence in sentences:
+                    await pending.put(asyncio.create_task(generate_speech(sentence)))
+        finally:
+            await pending.put(None)
 
-    tts.save(tmp_path)
+    producer = asyncio.create_task(produce())
+    try:
+        while (task := await pending.get()) is not None:
+            yield await task
+        await producer
+    finally:
+        producer.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is not None:
+                task.cancel()
 
-    return tmp_path
\ No newline at end of file
+def cache_stats() -> dict:
+    stats = {"memory": memory_cache.stats()}
+    if disk_cache is not None:
+        stats["disk"] = disk_cache.stats()
+    return stats
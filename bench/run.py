@@ -0,0 +1,349 @@
+# bench/run.py
+
+"""
+End-to-end load / latency benchmark
+app.main.app을 같은 process에서 실행하고 (httpx ASGITransport, network 없음) 실제 API 흐름을 재현한다.
+
+실행: python -m bench.run --users 20 --concurrency 10 --turns 5 --voice-ratio 0.3 --out bench.json
+
+- DB: 기본은 임시 SQLite file (sqlite+aiosqlite), --database-url로 Postgres 등 지정,
+      --repository memory면 DB 없이 in-memory repository (DB statement 수는 0)
+- STT/TTS: fake backend (STT_BACKEND=fake, TTS_BACKEND=fake), LLM: app.services.llm
+- Scenario
+  - chat: 가상 user마다 signup -> login -> 대화 생성 -> text/voice turn 반복 (voice면 audio 받기)
+          -> streaming turn -> 목록/메시지 조회 -> 검색 -> 삭제
+  - login_storm: 가입된 user들이 동시에 login (password hashing pool)
+  - chat_during_login_storm: chat 흐름과 login_storm을 동시에 실행해, login burst 중의 chat latency를 잰다
+    (storm의 login은 "POST /auth/token (storm)"으로 따로 집계)
+- 결과(JSON): scenario별 처리량(req/s), endpoint별 p50/p95/p99/mean latency(ms), error 수,
+  요청당 DB statement 수. commit 간 diff 할 수 있도록 key 순서를 고정해 출력한다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 요청 하나 동안 실행된 DB statement 수 (요청을 보내는 task의 context로 전달된다)
+_statements: ContextVar[list[int] | None] = ContextVar("bench_statements", default=None)
+
+def percentile(
+        values: list[float],
+        q: float
+) -> float:
+    """
+    Nearest-rank percentile
+    """
+    ordered = sorted(values)
+    rank = max(1, round(q / 100 * len(ordered) + 0.5 - 1e-9))
+    return ordered[min(rank, len(ordered)) - 1]
+
+class Recorder:
+    """
+    Endpoint(label)별 latency, error, DB statement 수 기록
+    """
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statements: dict[str, int] = defaultdict(int)
+
+    def on_statement(self, *args) -> None:
+        counter = _statements.get()
+        if counter is not None:
+            counter[0] += 1
+
+    async def request(
+            self,
+            client,
+            label: str,
+            method: str,
+            url: str,
+            expected: tuple[int, ...] = (200, 201, 204),
+            **kwargs
+    ):
+        counter = [0]
+        token = _statements.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _statements.reset(token)
+        self.latencies[label].append(elapsed)
+        self.statements[label] += counter[0]
+        if response.status_code not in expected:
+            self.errors[label] += 1
+        return response
+
+    def report(
+            self,
+            duration: float
+    ) -> dict:
+        total = sum(len(values) for values in self.latencies.values())
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = self.latencies[label]
+            endpoints[label] = {
+                "count": len(values),
+                "errors": self.errors[label],
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "db_statements_per_request": round(self.statements[label] / len(values), 2),
+            }
+        return {
+            "duration_s": round(duration, 3),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(total / duration, 2) if duration else 0.0,
+            "endpoints": endpoints,
+        }
+
+def _credentials(
+        index: int
+) -> dict:
+    return {"username": f"bench{index}", "email": f"bench{index}@example.com", "password": "bench-password"}
+
+async def _login(
+        recorder: Recorder,
+        client,
+        index: int,
+        label: str = "POST /auth/token"
+) -> dict:
+    credentials = _credentials(index)
+    response = await recorder.request(
+        client, label, "POST", "/auth/token",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def chat_session(
+        recorder: Recorder,
+        client,
+        index: int,
+        args: argparse.Namespace
+) -> None:
+    """
+    가상 user 한 명의 대화 흐름
+    """
+    rng = random.Random(args.seed + index)
+
+    await recorder.request(client, "POST /auth/signup", "POST", "/auth/signup", json=_credentials(index))
+    headers = await _login(recorder, client, index)
+
+    response = await recorder.request(
+        client, "POST /chat/conversations", "POST", "/chat/conversations",
+        json={"content": f"{1000 + index}번 문제는 어떻게 풀어야 하나요?"}, headers=headers,
+    )
+    conv_id = response.json()["id"]
+    messages_url = f"/chat/conversations/{conv_id}/messages"
+
+    for turn in range(args.turns):
+        question = f"질문 {turn}: 시간 복잡도를 줄이려면 어떤 자료구조를 써야 할까요? " * rng.randint(1, 4)
+        if rng.random() < args.voice_ratio:
+            # fake STT는 audio bytes를 UTF-8 text로 간주한다
+            response = await recorder.request(
+                client, "POST /chat/conversations/{id}/messages (voice)", "POST", messages_url,
+                json={"voice": question}, headers=headers,
+            )
+            if audio_url := response.json().get("audio_url"):
+                await recorder.request(
+                    client, "GET /chat/conversations/{id}/messages/{id}/audio", "GET", audio_url,
+                    headers=headers,
+                )
+        else:
+            await recorder.request(
+                client, "POST /chat/conversations/{id}/messages", "POST", messages_url,
+                json={"content": question}, headers=headers,
+            )
+
+    if args.stream:
+        await recorder.request(
+            client, "POST /chat/conversations/{id}/messages/stream", "POST", f"{messages_url}/stream",
+            json={"content": "마지막으로 정리해 주세요."}, headers=headers,
+        )
+
+    await recorder.request(client, "GET /chat/conversations", "GET", "/chat/conversations", headers=headers)
+    await recorder.request(
+        client, "GET /chat/conversations/{id}", "GET", f"/chat/conversations/{conv_id}", headers=headers,
+    )
+    await recorder.request(
+        client, "GET /chat/conversations/{id}/messages", "GET", messages_url,
+        params={"limit": 50}, headers=headers,
+    )
+    await recorder.request(
+        client, "GET /chat/search", "GET", "/chat/search",
+        params={"q": "자료구조 시간"}, headers=headers,
+    )
+    await recorder.request(
+        client, "DELETE /chat/conversations/{id}", "DELETE", f"/chat/conversations/{conv_id}",
+        headers=headers,
+    )
+
+async def _run_concurrently(
+        concurrency: int,
+        jobs
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            await job
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+@contextmanager
+def _count_statements(
+        engine,
+        recorder: Recorder
+):
+    """
+    DB statement 실행마다 recorder.on_statement 호출 (memory repository면 engine이 없으므로 생략)
+    """
+    if engine is None:
+        yield
+        return
+    from sqlalchemy import event
+
+    event.listen(engine.sync_engine, "before_cursor_execute", recorder.on_statement)
+    try:
+        yield
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", recorder.on_statement)
+
+async def run_benchmark(
+        args: argparse.Namespace
+) -> dict:
+    import httpx
+
+    from app.db import database
+    from app.main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            if "chat" in args.scenarios:
+                recorder = Recorder()
+                with _count_statements(database.engine, recorder):
+                    start = time.perf_counter()
+                    await _run_concurrently(
+                        args.concurrency,
+                        [chat_session(recorder, client, index, args) for index in range(args.users)],
+                    )
+                    results["chat"] = recorder.report(time.perf_counter() - start)
+
+            if "login_storm" in args.scenarios:
+                if "chat" not in args.scenarios:
+                    for index in range(args.users):
+                        await client.post("/auth/signup", json=_credentials(index))
+                recorder = Recorder()
+                with _count_statements(database.engine, recorder):
+                    start = time.perf_counter()
+                    await _run_concurrently(
+                        args.concurrency,
+                        [_login(recorder, client, index % args.users) for index in range(args.logins)],
+                    )
+                    results["login_storm"] = recorder.report(time.perf_counter() - start)
+
+            if "chat_during_login_storm" in args.scenarios:
+                # 앞 scenario와 겹치지 않는 user: chat은 [users, 2*users), storm은 [2*users, 3*users)
+                chat_base, storm_base = args.users, 2 * args.users
+                for index in range(args.users):
+                    await client.post("/auth/signup", json=_credentials(storm_base + index))
+                recorder = Recorder()
+                with _count_statements(database.engine, recorder):
+                    start = time.perf_counter()
+                    await asyncio.gather(
+                        _run_concurrently(
+                            args.concurrency,
+                            [chat_session(recorder, client, chat_base + index, args) for index in range(args.users)],
+                        ),
+                        _run_concurrently(
+                            args.concurrency,
+                            [
+                                _login(recorder, client, storm_base + index % args.users, label="POST /auth/token (storm)")
+                                for index in range(args.logins)
+                            ],
+                        ),
+                    )
+                    results["chat_during_login_storm"] = recorder.report(time.perf_counter() - start)
+    return results
+
+def parse_args(
+        argv: list[str] | None = None
+) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Baekjoon Talk end-to-end benchmark")
+    parser.add_argument("--users", type=int, default=20, help="가상 user 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 실행하는 user(요청) 수")
+    parser.add_argument("--turns", type=int, default=5, help="user당 chat turn 수")
+    parser.add_argument("--voice-ratio", type=float, default=0.3, help="voice turn 비율 (0~1)")
+    parser.add_argument("--no-stream", dest="stream", action="store_false", help="streaming turn 생략")
+    parser.add_argument("--logins", type=int, default=100, help="login_storm의 login 요청 수")
+    parser.add_argument(
+        "--scenarios", nargs="+",
+        choices=["chat", "login_storm", "chat_during_login_storm"],
+        default=["chat", "login_storm", "chat_during_login_storm"],
+    )
+    parser.add_argument("--database-url", default=None, help="기본: 임시 SQLite file")
+    parser.add_argument(
+        "--repository", choices=["sql", "memory"], default="sql", help="memory: DB 없이 in-memory repository",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="결과 JSON file (기본: stdout)")
+    return parser.parse_args(argv)
+
+def main(
+        argv: list[str] | None = None
+) -> None:
+    args = parse_args(argv)
+
+    # app import 전에 설정 (Settings는 import 시점에 환경변수를 읽는다)
+    tmpdir = tempfile.TemporaryDirectory(prefix="bench-")
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["REPOSITORY_BACKEND"] = args.repository
+    os.environ["DB_ECHO"] = "false"
+    os.environ["STT_BACKEND"] = "fake"
+    os.environ["TTS_BACKEND"] = "fake"
+    # 가상 user 수/동시성 자체를 측정하므로 요청 제한은 끈다
+    os.environ.setdefault("RATE_LIMIT_BURST", "0")
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", "0")
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-only-secret-key-not-for-production")
+
+    try:
+        results = asyncio.run(run_benchmark(args))
+    finally:
+        tmpdir.cleanup()
+
+    report = {
+        "config": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "turns": args.turns,
+            "voice_ratio": args.voice_ratio,
+            "stream": args.stream,
+            "logins": args.logins,
+            "database": "memory" if args.repository == "memory" else database_url.split("://", 1)[0],
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+-- migrations/0001_message_seq.sql
+-- Message 순번(seq)과 Conversation.last_seq 추가 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0001_message_seq.sql
+
+BEGIN;
+
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS last_seq INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE message ADD COLUMN IF NOT EXISTS seq INTEGER;
+
+-- 기존 메시지에는 순서 정보가 없으므로 물리적 저장 순서(ctid)로 순번을 매긴다
+UPDATE message AS m
+SET seq = numbered.rn
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY conv_id ORDER BY ctid) AS rn
+    FROM message
+) AS numbered
+WHERE m.id = numbered.id AND m.seq IS NULL;
+
+ALTER TABLE message ALTER COLUMN seq SET NOT NULL;
+
+UPDATE conversation AS c
+SET last_seq = COALESCE((SELECT max(m.seq) FROM message AS m WHERE m.conv_id = c.id), 0);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_message_conv_id_seq ON message (conv_id, seq);
+
+COMMIT;
@@ -0,0 +1,39 @@
+-- migrations/0002_indexes_timestamptz.sql
+-- 조회 경로 index 추가, 시각 column을 timestamptz로 변환 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0002_indexes_timestamptz.sql
+--
+-- 기존 last_modified 값은 서버 local time의 ISO 문자열이므로,
+-- 실행 전 session TimeZone을 API 서버의 timezone과 맞출 것 (예: SET TimeZone = 'Asia/Seoul';)
+--
+-- user.email에 unique index를 만들기 전에 중복 email이 없는지 확인할 것:
+--   SELECT email, count(*) FROM "user" GROUP BY email HAVING count(*) > 1;
+
+BEGIN;
+
+-- Conversation.last_modified: ISO 문자열 -> timestamptz
+ALTER TABLE conversation
+    ALTER COLUMN last_modified TYPE TIMESTAMPTZ USING last_modified::timestamptz;
+
+-- Message.created_at: 기존 메시지는 작성 시각을 알 수 없으므로 대화의 last_modified로 채운다
+ALTER TABLE message ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ;
+UPDATE message AS m
+SET created_at = c.last_modified
+FROM conversation AS c
+WHERE m.conv_id = c.id AND m.created_at IS NULL;
+UPDATE message SET created_at = now() WHERE created_at IS NULL;
+ALTER TABLE message ALTER COLUMN created_at SET NOT NULL;
+
+-- list_user_conversation: WHERE owner_id = ? ORDER BY last_modified DESC
+CREATE INDEX IF NOT EXISTS ix_conversation_owner_id_last_modified
+    ON conversation (owner_id, last_modified DESC);
+
+-- get_user_by_email (로그인, get_current_user)
+CREATE UNIQUE INDEX IF NOT EXISTS ix_user_email ON "user" (email);
+
+-- list_messages_by_conversation: (conv_id, seq)는 0001_message_seq.sql에서 생성
+
+COMMIT;
+
+ANALYZE conversation;
+ANALYZE message;
+ANALYZE "user";
@@ -0,0 +1,17 @@
+-- migrations/0003_conversation_soft_delete.sql
+-- Conversation soft delete (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0003_conversation_soft_delete.sql
+--
+-- DELETE /chat/conversations/{id}는 deleted_at만 기록하고,
+-- Message/Conversation row는 app.services.purger가 batch 단위로 삭제한다.
+
+BEGIN;
+
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+
+COMMIT;
+
+-- purger 조회용 partial index (삭제 표시된 row만 포함)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conversation_deleted_at
+    ON conversation (deleted_at)
+    WHERE deleted_at IS NOT NULL;
@@ -0,0 +1,15 @@
+-- migrations/0004_token_count_summary.sql
+-- Message.token_count, Conversation rolling summary 추가 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0004_token_count_summary.sql
+
+BEGIN;
+
+ALTER TABLE message ADD COLUMN IF NOT EXISTS token_count INTEGER NOT NULL DEFAULT 0;
+
+-- 기존 메시지: app.services.llm.count_tokens와 같은 식 (UTF-8 4 bytes당 1 token)
+UPDATE message SET token_count = (octet_length(content) + 3) / 4 WHERE token_count = 0;
+
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS summary_upto_seq INTEGER NOT NULL DEFAULT 0;
+
+COMMIT;
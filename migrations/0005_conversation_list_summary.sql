@@ -0,0 +1,24 @@
+-- migrations/0005_conversation_list_summary.sql
+-- 대화 목록 표시용 denormalized column 추가 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0005_conversation_list_summary.sql
+
+BEGIN;
+
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS last_message_preview TEXT;
+ALTER TABLE conversation ADD COLUMN IF NOT EXISTS last_sender TEXT;
+
+-- 기존 대화: 마지막 Message(seq 최대)와 Message 수로 채운다 (ix_message_conv_id_seq 사용)
+UPDATE conversation AS c
+SET message_count = stats.message_count,
+    last_message_preview = left(last.content, 100),
+    last_sender = last.sender
+FROM (
+    SELECT conv_id, count(*) AS message_count, max(seq) AS last_seq
+    FROM message
+    GROUP BY conv_id
+) AS stats
+JOIN message AS last ON last.conv_id = stats.conv_id AND last.seq = stats.last_seq
+WHERE c.id = stats.conv_id;
+
+COMMIT;
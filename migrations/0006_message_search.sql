@@ -0,0 +1,14 @@
+-- migrations/0006_message_search.sql
+-- Message full-text search index (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0006_message_search.sql
+--
+-- 새로 만드는 DB는 create_all 시 app/models/message.py의 DDL event로 같은 column/index가 생성된다.
+-- generated column 추가는 table을 다시 쓰므로 message가 많으면 점검 시간에 실행할 것.
+
+ALTER TABLE message ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_message_search_vector
+    ON message USING gin (search_vector);
+
+ANALYZE message;
@@ -0,0 +1,13 @@
+-- migrations/0007_conversation_keyset_id.sql
+-- 대화 목록 keyset cursor에 id tiebreaker 추가 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0007_conversation_keyset_id.sql
+--
+-- list_user_conversation: WHERE owner_id = ? AND deleted_at IS NULL
+--                         AND (last_modified, id) < (?, ?) ORDER BY last_modified DESC, id DESC
+-- CONCURRENTLY는 transaction 안에서 실행할 수 없으므로 BEGIN/COMMIT 없이 실행한다.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conversation_owner_id_last_modified_id
+    ON conversation (owner_id, last_modified DESC, id DESC)
+    WHERE deleted_at IS NULL;
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_conversation_owner_id_last_modified;
@@ -0,0 +1,26 @@
+-- migrations/0008_message_search_owner.sql
+-- Message 검색 index를 owner 단위로 (PostgreSQL)
+-- 사용법: psql -d <POSTGRES_DB> -f migrations/0008_message_search_owner.sql
+--
+-- search_messages: WHERE owner_id = ? AND search_vector @@ ? 를 (owner_id, search_vector) GIN index 하나로 찾는다
+-- (기존 index는 모든 user의 일치 message를 읽은 뒤 conversation.owner_id로 걸러냈다)
+-- btree_gin extension은 CREATE 권한이 필요하다.
+-- backfill UPDATE는 message 전체를 다시 쓰므로 message가 많으면 점검 시간에 실행할 것.
+-- CONCURRENTLY는 transaction 안에서 실행할 수 없으므로 BEGIN/COMMIT 없이 실행한다.
+
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+ALTER TABLE message ADD COLUMN IF NOT EXISTS owner_id VARCHAR;
+
+UPDATE message AS m SET owner_id = c.owner_id
+FROM conversation AS c
+WHERE c.id = m.conv_id AND m.owner_id IS NULL;
+
+ALTER TABLE message ALTER COLUMN owner_id SET NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_message_owner_id_search_vector
+    ON message USING gin (owner_id, search_vector);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_message_search_vector;
+
+ANALYZE message;
@@ -0,0 +1,70 @@
+# tests/conftest.py
+
+"""
+App을 같은 process에서 실행하는 test 환경 (fastapi TestClient, network 없음)
+- DB: 임시 SQLite file (sqlite+aiosqlite), STT/TTS: fake backend
+- Settings는 import 시점에 환경변수를 읽으므로 app import 전에 설정한다
+"""
+
+import os
+import tempfile
+import uuid
+
+_tmpdir = tempfile.TemporaryDirectory(prefix="baekjoon-test-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmpdir.name, 'test.db')}"
+os.environ["REPOSITORY_BACKEND"] = "sql"
+os.environ["DB_ECHO"] = "false"
+os.environ["STT_BACKEND"] = "fake"
+os.environ["TTS_BACKEND"] = "fake"
+os.environ["LLM_CACHE_SIZE"] = "0"
+os.environ["RATE_LIMIT_BURST"] = "0"
+os.environ["LLM_MAX_CONCURRENCY"] = "0"
+os.environ.setdefault("JWT_SECRET_KEY", "test-only-secret-key-not-for-production")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.db.database import engine
+from app.main import app
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def new_auth_headers(client):
+    """
+    호출할 때마다 새 user로 가입/login 후 Authorization header
+    """
+    def signup() -> dict:
+        name = f"user-{uuid.uuid4().hex[:8]}"
+        credentials = {"username": name, "email": f"{name}@example.com", "password": "test-password"}
+        response = client.post("/auth/signup", json=credentials)
+        assert response.status_code == 201, response.text
+        response = client.post("/auth/token", data={"username": credentials["email"], "password": credentials["password"]})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return signup
+
+@pytest.fixture
+def auth_headers(new_auth_headers) -> dict:
+    """
+    새 user로 가입/login 후 Authorization header
+    """
+    return new_auth_headers()
+
+@pytest.fixture
+def statements() -> list[tuple[str, tuple]]:
+    """
+    Test 동안 실행된 SQL (statement, parameters) 목록
+    """
+    captured = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
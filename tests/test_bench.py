@@ -0,0 +1,25 @@
+# tests/test_bench.py
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_bench_chat_scenario_exits_and_writes_report(tmp_path):
+    """
+    python -m bench.run (main)이 lifespan 종료까지 끝나고 --out에 오류 없는 결과를 쓰는지
+    별도 process에서 실행한다 (app을 bench 설정으로 새로 import, 종료가 멈추면 timeout으로 실패)
+    """
+    out = tmp_path / "bench.json"
+    argv = ["--users", "3", "--concurrency", "3", "--turns", "2", "--scenarios", "chat", "--out", str(out)]
+    subprocess.run(
+        [sys.executable, "-m", "bench.run", *argv],
+        cwd=ROOT, check=True, timeout=60, capture_output=True,
+    )
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    chat = report["scenarios"]["chat"]
+    assert chat["requests"] > 0 and chat["errors"] == 0
+    assert all(endpoint["errors"] == 0 for endpoint in chat["endpoints"].values())
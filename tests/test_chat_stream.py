@@ -0,0 +1,128 @@
+# tests/test_chat_stream.py
+
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.crud import conversation as crud_conversation
+from app.crud import message as crud_message
+from app.db.database import async_session
+from app.db.memory import MemoryRepository
+from app.routers.chat import _merge
+from app.services import history, llm
+
+def _events(
+        body: str
+) -> list[tuple[str, dict]]:
+    """
+    SSE body -> [(event, data)] (event 하나는 "event:" / "data:" 두 줄 + 빈 줄)
+    """
+    events = []
+    for block in body.split("\n\n"):
+        if not block:
+            continue
+        lines = block.split("\n")
+        assert len(lines) == 2 and lines[0].startswith("event: ") and lines[1].startswith("data: "), block
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+def test_stream_sends_tokens_in_order_and_persists_reply(client, auth_headers, monkeypatch):
+    tokens = ["세그먼트 ", "트리는 ", "구간 ", "합을 ", "O(log n)에 ", "구합니다."]
+
+    async def stream_response(messages, use_cache=True):
+        assert messages[-1] == {"role": "user", "content": "세그먼트 트리?"}
+        for token in tokens:
+            yield token
+
+    conv_id = client.post("/chat/conversations", json={"content": "안녕"}, headers=auth_headers).json()["id"]
+    monkeypatch.setattr(llm, "stream_response", stream_response)
+
+    response = client.post(
+        f"/chat/conversations/{conv_id}/messages/stream",
+        json={"content": "세그먼트 트리?"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(response.text)
+    assert [event for event, _ in events] == ["message"] + ["token"] * len(tokens) + ["done"]
+    user_message = events[0][1]
+    assert user_message["sender"] != "assistant" and user_message["content"] == "세그먼트 트리?"
+    assert [data["content"] for _, data in events[1:-1]] == tokens
+    done = events[-1][1]
+    assert done["sender"] == "assistant"
+    assert done["content"] == "".join(tokens)
+    assert done["seq"] == user_message["seq"] + 1
+
+    messages = client.get(f"/chat/conversations/{conv_id}/messages", headers=auth_headers).json()
+    assert messages[-1] == {"id": done["id"], "seq": done["seq"], "sender": "assistant", "content": "".join(tokens), "audio_url": None}
+
+def test_conversation_deleted_during_stream_ends_with_error_event(client, auth_headers, monkeypatch):
+    conv_id = client.post("/chat/conversations", json={"content": "안녕"}, headers=auth_headers).json()["id"]
+
+    async def stream_response(messages, use_cache=True):
+        yield "첫 "
+        # 답변 생성 도중 대화 삭제 (DELETE /chat/conversations/{id}와 같은 soft delete)
+        async with async_session() as session:
+            await crud_conversation.mark_deleted(session, conv_id)
+        yield "토큰"
+
+    monkeypatch.setattr(llm, "stream_response", stream_response)
+    response = client.post(f"/chat/conversations/{conv_id}/messages/stream", json={"content": "질문"}, headers=auth_headers)
+    assert response.status_code == 200
+
+    events = _events(response.text)
+    assert [event for event, _ in events] == ["message", "token", "token", "error"]
+    assert events[-1][1] == {"status": 404, "detail": "Conversation not found"}
+
+def test_memory_backend_rejects_messages_for_deleted_conversation():
+    repository = MemoryRepository()
+
+    async def scenario():
+        conversation = await crud_conversation.create_conversation(repository, owner_id="owner", title="t")
+        await crud_conversation.mark_deleted(repository, conversation.id)
+        await crud_message.create_messages(repository, conversation.id, [("user", "hi")])
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 404
+
+def test_stream_turn_keeps_history_cache_complete_and_delete_invalidates(client, auth_headers, monkeypatch):
+    async def stream_response(messages, use_cache=True):
+        yield "답변"
+
+    conv_id = client.post("/chat/conversations", json={"content": "안녕"}, headers=auth_headers).json()["id"]
+    monkeypatch.setattr(llm, "stream_response", stream_response)
+    response = client.post(f"/chat/conversations/{conv_id}/messages/stream", json={"content": "질문"}, headers=auth_headers)
+    done = _events(response.text)[-1][1]
+
+    cached = history.history_cache.peek(conv_id)
+    assert [entry.seq for entry in cached] == [1, 2, 3, 4]
+    assert cached[-1].seq == done["seq"] and cached[-1].content == "답변"
+
+    assert client.delete(f"/chat/conversations/{conv_id}", headers=auth_headers).status_code == 200
+    assert history.history_cache.peek(conv_id) is None
+
+def test_merge_applies_backpressure_to_streams():
+    produced = []
+
+    async def tokens():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    async def scenario():
+        merged = _merge(tokens())
+        first = await anext(merged)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        ahead = len(produced)
+        await merged.aclose()
+        return first, ahead
+
+    first, ahead = asyncio.run(scenario())
+    # 소비하지 않는 동안 stream은 queue 크기(1) + 대기 중인 put 하나 이상 앞서가지 않는다
+    assert first == 0 and ahead <= 3
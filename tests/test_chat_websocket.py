@@ -0,0 +1,108 @@
+# tests/test_chat_websocket.py
+
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.services import llm
+
+TOKENS = ["다익스트라는 ", "음수 간선이 ", "없을 때 쓴다. ", "힙을 쓴다."]
+
+@pytest.fixture
+def conv_id(client, auth_headers) -> str:
+    return client.post("/chat/conversations", json={"content": "안녕"}, headers=auth_headers).json()["id"]
+
+@pytest.fixture(autouse=True)
+def stream_response(monkeypatch):
+    async def stream_response(messages, use_cache=True):
+        for token in TOKENS:
+            yield token
+
+    monkeypatch.setattr(llm, "stream_response", stream_response)
+
+def _receive(
+        websocket
+) -> dict | bytes:
+    """
+    다음 frame (text는 JSON dict, binary는 bytes), heartbeat ping은 건너뛴다
+    """
+    while True:
+        message = websocket.receive()
+        if message["type"] == "websocket.close":
+            return message
+        if message.get("bytes") is not None:
+            return message["bytes"]
+        frame = json.loads(message["text"])
+        if frame != {"type": "ping"}:
+            return frame
+
+def _turn(
+        websocket
+) -> list[dict | bytes]:
+    """
+    한 turn의 frame 목록 (done 또는 error까지)
+    """
+    frames = [_receive(websocket)]
+    while not (isinstance(frames[-1], dict) and frames[-1].get("type") in ("done", "error")):
+        frames.append(_receive(websocket))
+    return frames
+
+def test_websocket_rejects_invalid_token(client, conv_id):
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect(f"/chat/ws/{conv_id}?token=invalid"):
+            pass
+    assert error.value.code == 1008
+
+def test_websocket_rejects_other_users_conversation(client, conv_id, new_auth_headers):
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect(f"/chat/ws/{conv_id}", headers=new_auth_headers()):
+            pass
+    assert error.value.code == 1008
+
+def test_websocket_ping_gets_pong(client, conv_id, auth_headers):
+    with client.websocket_connect(f"/chat/ws/{conv_id}", headers=auth_headers) as websocket:
+        websocket.send_json({"type": "ping"})
+        assert _receive(websocket) == {"type": "pong"}
+
+def test_websocket_text_turn_sends_message_tokens_done(client, conv_id, auth_headers):
+    with client.websocket_connect(f"/chat/ws/{conv_id}", headers=auth_headers) as websocket:
+        websocket.send_json({"type": "message", "content": "다익스트라?"})
+        frames = _turn(websocket)
+
+    assert [frame["type"] for frame in frames] == ["message"] + ["token"] * len(TOKENS) + ["done"]
+    assert frames[0]["content"] == "다익스트라?"
+    assert [frame["content"] for frame in frames[1:-1]] == TOKENS
+    assert frames[-1]["sender"] == "assistant" and frames[-1]["content"] == "".join(TOKENS)
+    assert frames[-1]["seq"] == frames[0]["seq"] + 1
+
+def test_websocket_voice_turn_sends_audio_header_then_binary_frame(client, conv_id, auth_headers):
+    with client.websocket_connect(f"/chat/ws/{conv_id}", headers=auth_headers) as websocket:
+        websocket.send_bytes(b"fake audio")
+        frames = _turn(websocket)
+
+    assert frames[0]["type"] == "message" and frames[-1]["type"] == "done"
+    assert frames[-1]["audio_url"]
+    audio = [i for i, frame in enumerate(frames) if isinstance(frame, dict) and frame["type"] == "audio"]
+    assert [frames[i]["index"] for i in audio] == list(range(len(audio))) and audio
+    # audio header 바로 다음은 항상 binary frame이고, binary frame은 header 뒤에만 온다
+    assert all(isinstance(frames[i + 1], bytes) and frames[i + 1] for i in audio)
+    assert [i for i, frame in enumerate(frames) if isinstance(frame, bytes)] == [i + 1 for i in audio]
+    assert [frame["content"] for frame in frames if isinstance(frame, dict) and frame["type"] == "token"] == TOKENS
+
+def test_websocket_bad_input_sends_error_and_keeps_connection(client, conv_id, auth_headers):
+    with client.websocket_connect(f"/chat/ws/{conv_id}", headers=auth_headers) as websocket:
+        websocket.send_text("{not json")
+        assert _receive(websocket) == {"type": "error", "status": 400, "detail": "Invalid JSON"}
+        websocket.send_json({"type": "message"})
+        assert _receive(websocket) == {"type": "error", "status": 422, "detail": "content is required"}
+
+        websocket.send_json({"type": "ping"})
+        assert _receive(websocket) == {"type": "pong"}
+
+def test_websocket_deleted_conversation_sends_404_and_closes(client, conv_id, auth_headers):
+    with client.websocket_connect(f"/chat/ws/{conv_id}", headers=auth_headers) as websocket:
+        assert client.delete(f"/chat/conversations/{conv_id}", headers=auth_headers).status_code == 200
+        websocket.send_json({"type": "message", "content": "남아 있나?"})
+        assert _receive(websocket) == {"type": "error", "status": 404, "detail": "Conversation not found"}
+        assert _receive(websocket)["type"] == "websocket.close"
@@ -0,0 +1,16 @@
+# tests/test_conversation_create.py
+
+def test_start_conversation_returns_first_message_and_list_fields(client, auth_headers):
+    response = client.post("/chat/conversations", json={"content": "1000번 A+B 풀이"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+    created = response.json()
+
+    assert created["first_message"]["seq"] == 1
+    assert created["first_message"]["content"] == "1000번 A+B 풀이"
+    assert created["message_count"] == 2
+    assert created["last_sender"] == "assistant"
+
+    # 목록 조회 결과와 같은 값
+    listed = next(c for c in client.get("/chat/conversations", headers=auth_headers).json() if c["id"] == created["id"])
+    for field in ("title", "message_count", "last_message_preview", "last_sender"):
+        assert created[field] == listed[field], field
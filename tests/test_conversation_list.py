@@ -0,0 +1,77 @@
+# tests/test_conversation_list.py
+
+import asyncio
+import datetime as dt
+
+from sqlmodel import update
+
+from app.crud import conversation as crud_conversation
+from app.db.database import async_session
+from app.db.memory import MemoryRepository
+from app.models.conversation import Conversation
+
+SAME_TIME = dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc)
+
+def _pages(
+        fetch,
+        limit: int
+) -> list[list[str]]:
+    """
+    before / before_id cursor로 끝까지 page를 넘기며 id 목록 수집 (빈 page에서 멈춤)
+    """
+    pages = [[c["id"] for c in fetch({"limit": limit})]]
+    while pages[-1]:
+        last = pages[-1][-1]
+        pages.append([c["id"] for c in fetch({"limit": limit, "before": SAME_TIME.isoformat(), "before_id": last})])
+    return pages
+
+def test_pagination_with_equal_last_modified_is_stable(client, auth_headers):
+    ids = [
+        client.post("/chat/conversations", json={"content": f"q{i}"}, headers=auth_headers).json()["id"]
+        for i in range(5)
+    ]
+
+    async def set_same_time():
+        async with async_session() as session:
+            await session.exec(update(Conversation).where(Conversation.id.in_(ids)).values(last_modified=SAME_TIME))
+            await session.commit()
+    client.portal.call(set_same_time)
+
+    def fetch(params):
+        response = client.get("/chat/conversations", params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    pages = _pages(fetch, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1, 0]
+    assert sum(pages, []) == sorted(ids, reverse=True)
+
+def test_memory_backend_paginates_like_sql():
+    repository = MemoryRepository()
+
+    async def scenario():
+        ids = []
+        for i in range(5):
+            conversation = await crud_conversation.create_conversation(repository, owner_id="owner", title=f"c{i}")
+            ids.append(conversation.id)
+        for conv_id in ids:
+            repository._unindex_conversation(repository.conversations[conv_id])
+            repository.conversations[conv_id].last_modified = SAME_TIME
+            repository._index_conversation(repository.conversations[conv_id])
+
+        async def fetch(params):
+            before = params.get("before")
+            conversations = await crud_conversation.list_user_conversation(
+                repository, "owner", limit=params["limit"],
+                before=dt.datetime.fromisoformat(before) if before else None, before_id=params.get("before_id"),
+            )
+            return [{"id": c.id} for c in conversations]
+
+        pages = [[c["id"] for c in await fetch({"limit": 2})]]
+        while pages[-1]:
+            pages.append([c["id"] for c in await fetch({"limit": 2, "before": SAME_TIME.isoformat(), "before_id": pages[-1][-1]})])
+        return ids, pages
+
+    ids, pages = asyncio.run(scenario())
+    assert [len(page) for page in pages] == [2, 2, 1, 0]
+    assert sum(pages, []) == sorted(ids, reverse=True)
@@ -0,0 +1,25 @@
+# tests/test_history.py
+
+import datetime as dt
+
+from app.models.message import Message
+from app.services import history
+
+def _message(
+        seq: int
+) -> Message:
+    return Message(
+        conv_id="conv", owner_id="owner", seq=seq, sender="user", content=f"m{seq}",
+        created_at=dt.datetime.now(dt.timezone.utc),
+    )
+
+def test_append_does_not_count_as_cache_lookup():
+    history.invalidate("conv")
+    hits, misses = history.history_cache.hits, history.history_cache.misses
+
+    history.append("conv", [_message(1), _message(2)])
+    history.append("conv", [_message(3)])
+
+    assert (history.history_cache.hits, history.history_cache.misses) == (hits, misses)
+    assert [entry.seq for entry in history.history_cache.peek("conv")] == [1, 2, 3]
+    history.invalidate("conv")
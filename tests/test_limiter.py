@@ -0,0 +1,50 @@
+# tests/test_limiter.py
+
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.limiter import MemoryStore, StoreConcurrencyLimiter
+
+def _limiter(
+        store: MemoryStore,
+        lease: float = 300.0
+) -> StoreConcurrencyLimiter:
+    return StoreConcurrencyLimiter("llm", store, limit=1, max_queue=1, timeout=0.05, poll_interval=0.01, lease=lease)
+
+def test_store_limiter_rejects_when_slots_and_queue_are_full():
+    async def scenario():
+        limiter = _limiter(MemoryStore())
+        async with limiter.slot():
+            waiter = asyncio.create_task(limiter.slot().__aenter__())
+            await asyncio.sleep(0.01)
+            with pytest.raises(HTTPException) as error:
+                async with limiter.slot():
+                    pass
+            assert error.value.status_code == 503
+            with pytest.raises(HTTPException):
+                await waiter
+        # 반환된 slot은 바로 다시 쓸 수 있다
+        async with limiter.slot():
+            pass
+
+    asyncio.run(scenario())
+
+def test_store_limiter_leaked_slot_expires_under_steady_traffic():
+    async def scenario():
+        store = MemoryStore()
+        limiter = _limiter(store, lease=0.3)
+        # 반환하지 못하고 종료된 worker가 남긴 slot
+        assert await store.compare_and_set("llm:slot:0", None, "crashed-worker", limiter.lease)
+
+        started = time.monotonic()
+        while True:
+            try:
+                async with limiter.slot():
+                    return time.monotonic() - started
+            except HTTPException:
+                pass
+
+    assert asyncio.run(asyncio.wait_for(scenario(), timeout=2)) >= 0.3
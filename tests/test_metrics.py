@@ -0,0 +1,26 @@
+# tests/test_metrics.py
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.metrics import instrument_engine, stage_seconds
+
+def _db_count() -> float:
+    series = stage_seconds._series.get(stage_seconds._key({"stage": "db"}))
+    return sum(series[:-1]) if series else 0
+
+def test_instrument_engine_does_not_leak_on_failed_statements():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    before = _db_count()
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert not any(key.startswith("metrics") for key in conn.info)
+
+    # 실패한 statement는 기록되지 않고, 성공한 statement는 자기 시작 시각으로 기록된다
+    assert _db_count() == before + 1
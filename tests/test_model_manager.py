@@ -0,0 +1,32 @@
+# tests/test_model_manager.py
+
+import threading
+import time
+
+from app.services.model_manager import ManagedModel
+
+def test_unload_if_idle_does_not_wait_for_a_load_in_progress():
+    loading = threading.Event()
+    release = threading.Event()
+
+    def loader():
+        loading.set()
+        release.wait(timeout=5)
+        return object()
+
+    model = ManagedModel("slow", loader, idle_ttl=0.01)
+    thread = threading.Thread(target=model.load)
+    thread.start()
+    try:
+        assert loading.wait(timeout=5)
+        start = time.monotonic()
+        assert model.unload_if_idle() is False
+        assert time.monotonic() - start < 0.5
+    finally:
+        release.set()
+        thread.join()
+
+    assert model.loaded
+    time.sleep(0.02)
+    assert model.unload_if_idle() is True
+    assert not model.loaded
@@ -0,0 +1,40 @@
+# tests/test_profiling.py
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.configuration import settings
+from app.core.profiling import ProfilingMiddleware
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware)
+    return TestClient(app)
+
+def test_sampled_request_gets_no_profile_headers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    response = _client().get("/ping")
+    assert response.status_code == 200
+    assert "x-profile-summary" not in response.headers
+    assert "x-profile-file" not in response.headers
+    assert len(list(tmp_path.glob("*.folded"))) == 1   # file로는 남는다
+
+def test_token_request_gets_profile_headers(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+
+    client = _client()
+    assert "x-profile-summary" not in client.get("/ping", headers={"X-Profile-Token": "wrong"}).headers
+
+    response = client.get("/ping", headers={"X-Profile-Token": "secret"})
+    assert response.headers["x-profile-summary"].startswith("samples=")
+    assert response.headers["x-profile-file"].startswith(str(tmp_path))
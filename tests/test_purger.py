@@ -0,0 +1,30 @@
+# tests/test_purger.py
+
+import asyncio
+
+from sqlmodel import func, select
+
+from app.crud import conversation as crud_conversation
+from app.db.database import async_session
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services import purger
+
+def test_purge_stops_after_committed_batch_when_stopping(client, auth_headers, monkeypatch):
+    conv_id = client.post("/chat/conversations", json={"content": "안녕"}, headers=auth_headers).json()["id"]
+    stop = asyncio.Event()
+    stop.set()
+    monkeypatch.setattr(purger, "_stop", stop)
+
+    async def scenario():
+        async with async_session() as session:
+            await crud_conversation.mark_deleted(session, conv_id)
+        purged = await purger.purge_once(batch_size=1)
+        async with async_session() as session:
+            remaining = (await session.exec(select(func.count()).where(Message.conv_id == conv_id))).one()
+            conversation = await session.get(Conversation, conv_id)
+        return purged, remaining, conversation
+
+    purged, remaining, conversation = client.portal.call(scenario)
+    # batch 하나(1개)만 지우고 commit 한 뒤 멈춘다. 나머지는 다음 실행 때 purge
+    assert purged == 0 and remaining == 1 and conversation is not None
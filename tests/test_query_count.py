@@ -0,0 +1,31 @@
+# tests/test_query_count.py
+
+"""
+Chat turn 하나가 실행하는 DB statement 수 고정 (user / history cache가 채워진 상태)
+"""
+
+def _verbs(
+        statements: list[tuple[str, tuple]]
+) -> list[str]:
+    return [statement.split(None, 1)[0].upper() for statement, _ in statements]
+
+def test_post_message_turn_statements(client, auth_headers, statements):
+    conv_id = client.post("/chat/conversations", json={"content": "첫 질문"}, headers=auth_headers).json()["id"]
+    client.post(f"/chat/conversations/{conv_id}/messages", json={"content": "warm-up"}, headers=auth_headers)
+
+    statements.clear()
+    response = client.post(f"/chat/conversations/{conv_id}/messages", json={"content": "두번째 질문"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    # get_conversation, seq 발급 + 목록 정보 갱신 (UPDATE ... RETURNING), User/Assistant Message INSERT
+    assert _verbs(statements) == ["SELECT", "UPDATE", "INSERT"], statements
+
+def test_start_conversation_statements(client, auth_headers, statements):
+    client.get("/chat/conversations", headers=auth_headers)   # user cache warm-up
+
+    statements.clear()
+    response = client.post("/chat/conversations", json={"content": "첫 질문"}, headers=auth_headers)
+    assert response.status_code == 201, response.text
+
+    # Conversation INSERT, seq 발급 UPDATE, Message INSERT (한 transaction)
+    assert _verbs(statements) == ["INSERT", "UPDATE", "INSERT"], statements
@@ -0,0 +1,62 @@
+# tests/test_query_plans.py
+
+"""
+요청마다 실행되는 query가 index를 타는지 확인 (SQLite EXPLAIN QUERY PLAN)
+app이 실제로 실행한 SQL을 그대로 가져와 plan을 본다 (deleted_at 조건 등이 바뀌어도 따라간다)
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.db.database import engine
+
+def _plan(
+        client,
+        statement: str,
+        parameters: tuple
+) -> str:
+    async def explain():
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(row[-1] for row in result.all())
+    return client.portal.call(explain)
+
+def _find(
+        statements: list[tuple[str, tuple]],
+        *fragments: str
+) -> tuple[str, tuple]:
+    matches = [(s, p) for s, p in statements if all(fragment in s for fragment in fragments)]
+    assert matches, f"no statement with {fragments}"
+    return matches[-1]
+
+@pytest.fixture
+def hot_queries(client, statements) -> list[tuple[str, tuple]]:
+    """
+    Login -> 대화 목록 -> Message 목록 (대화 하나, Message 몇 개)
+    """
+    name = f"plan-{uuid4().hex[:8]}"
+    client.post("/auth/signup", json={"username": name, "email": f"{name}@example.com", "password": "test-password"})
+    token = client.post("/auth/token", data={"username": f"{name}@example.com", "password": "test-password"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    conv_id = client.post("/chat/conversations", json={"content": "q"}, headers=headers).json()["id"]
+    client.post(f"/chat/conversations/{conv_id}/messages", json={"content": "q2"}, headers=headers)
+    statements.clear()
+    client.post("/auth/token", data={"username": f"{name}@example.com", "password": "test-password"})
+    client.get("/chat/conversations", params={"limit": 20}, headers=headers)
+    client.get(f"/chat/conversations/{conv_id}/messages", params={"limit": 20}, headers=headers)
+    return list(statements)
+
+def test_get_user_by_email_uses_unique_index(client, hot_queries):
+    plan = _plan(client, *_find(hot_queries, 'FROM user', "user.email = ?"))
+    assert "USING INDEX ix_user_email" in plan, plan
+
+def test_list_user_conversation_uses_owner_last_modified_index(client, hot_queries):
+    plan = _plan(client, *_find(hot_queries, "FROM conversation", "conversation.owner_id = ?", "ORDER BY"))
+    assert "USING INDEX ix_conversation_owner_id_last_modified_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan   # index 순서 그대로 (정렬 없음)
+
+def test_list_messages_uses_conv_id_seq_index(client, hot_queries):
+    plan = _plan(client, *_find(hot_queries, "FROM message", "message.conv_id = ?", "ORDER BY"))
+    assert "USING INDEX ix_message_conv_id_seq" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,51 @@
+# tests/test_search.py
+
+import asyncio
+
+from app.crud import conversation as crud_conversation
+from app.crud import message as crud_message
+from app.db.memory import MemoryRepository
+
+def test_memory_search_index_is_per_owner():
+    repository = MemoryRepository()
+
+    async def scenario():
+        mine = await crud_conversation.create_conversation(repository, owner_id="me", title="mine")
+        other = await crud_conversation.create_conversation(repository, owner_id="other", title="other")
+        await crud_message.create_messages(repository, mine.id, [("user", "dijkstra 질문")])
+        await crud_message.create_messages(repository, other.id, [("user", "dijkstra heap"), ("user", "heap only")])
+        hits = await crud_message.search_messages(repository, "me", "dijkstra", limit=10)
+        misses = await crud_message.search_messages(repository, "me", "heap", limit=10)
+        await crud_conversation.delete_conversation(repository, other.id)
+        return hits, misses
+
+    hits, misses = asyncio.run(scenario())
+    assert [hit["conversation_title"] for hit in hits] == ["mine"]
+    assert misses == []
+    # 다른 user의 term은 index에 없고, 삭제된 대화의 term은 index에서 빠진다
+    assert "heap" not in repository.postings["me"]
+    assert repository.postings["other"] == {} and repository.terms["other"] == []
+
+def test_memory_list_messages_after_cursor_respects_limit():
+    repository = MemoryRepository()
+
+    async def scenario():
+        conversation = await crud_conversation.create_conversation(repository, owner_id="me", title="t")
+        await crud_message.create_messages(repository, conversation.id, [("user", f"m{i}") for i in range(6)])
+        return await crud_message.list_messages_by_conversation(repository, conversation.id, after=1, limit=2)
+
+    assert [message.seq for message in asyncio.run(scenario())] == [2, 3]
+
+def test_search_snippet_escapes_html(client, auth_headers):
+    client.post("/chat/conversations", json={"content": "<script>x</script> dijkstra"}, headers=auth_headers)
+
+    hits = client.get("/chat/search", params={"q": "dijk"}, headers=auth_headers).json()
+    hit = next(hit for hit in hits if hit["sender"] != "assistant")
+    assert all("<script>" not in hit["snippet"] for hit in hits)
+    assert hit["snippet"] == "&lt;script&gt;x&lt;/script&gt; <b>dijkstra</b>"
+
+def test_search_only_returns_own_messages(client, auth_headers, new_auth_headers):
+    client.post("/chat/conversations", json={"content": "bellman ford"}, headers=auth_headers)
+
+    assert client.get("/chat/search", params={"q": "bellman"}, headers=auth_headers).json() != []
+    assert client.get("/chat/search", params={"q": "bellman"}, headers=new_auth_headers()).json() == []
@@ -0,0 +1,60 @@
+# tests/test_tts_cache.py
+
+import asyncio
+import os
+
+import pytest
+
+from app.core.cache import DiskCache, LRUCache
+from app.services import tts
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path) -> tts.FakeTTSBackend:
+    """
+    Fake backend + 비어 있는 memory/disk cache
+    """
+    backend = tts.FakeTTSBackend(lang="ko")
+    monkeypatch.setattr(tts, "backend", backend)
+    monkeypatch.setattr(tts, "memory_cache", LRUCache("tts", maxsize=100))
+    monkeypatch.setattr(tts, "disk_cache", DiskCache("tts_disk", str(tmp_path), max_bytes=1024 * 1024))
+    return backend
+
+def test_same_text_is_synthesized_once(backend):
+    async def scenario():
+        return [await tts.generate_speech("안녕하세요.") for _ in range(3)]
+
+    first, *rest = asyncio.run(scenario())
+    assert backend.calls == 1
+    assert all(audio == first for audio in rest)
+
+def test_backend_params_are_part_of_the_key(backend, monkeypatch):
+    key = tts.cache_key("안녕하세요.")
+    asyncio.run(tts.generate_speech("안녕하세요."))
+
+    monkeypatch.setattr(tts, "backend", tts.FakeTTSBackend(lang="en"))
+    assert tts.cache_key("안녕하세요.") != key
+    asyncio.run(tts.generate_speech("안녕하세요."))
+    assert backend.calls == 1 and tts.backend.calls == 1
+
+def test_disk_tier_serves_audio_after_memory_is_cleared(backend):
+    audio = asyncio.run(tts.generate_speech("디스크에 남는 문장."))
+    tts.memory_cache.clear()
+
+    assert asyncio.run(tts.generate_speech("디스크에 남는 문장.")) == audio
+    assert backend.calls == 1
+    assert tts.disk_cache.hits == 1
+    # disk에서 읽은 값은 memory에도 다시 올라간다
+    assert tts.memory_cache.get(tts.cache_key("디스크에 남는 문장.")) == audio
+
+def test_disk_cache_evicts_least_recently_used_file(tmp_path):
+    cache = DiskCache("test", str(tmp_path), max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    os.utime(tmp_path / "a", (100, 100))
+    os.utime(tmp_path / "b", (200, 200))
+    assert cache.get("a") == b"aaaa"   # a의 mtime이 갱신되어 b가 가장 오래 사용되지 않은 file
+
+    cache.set("c", b"cccc")
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] == 8